@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+
+    def ready(self):
+        from .metrics import connect_worker_signals
+        from .profiling import connect_task_signals
+        connect_task_signals()
+        connect_worker_signals()
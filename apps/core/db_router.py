@@ -0,0 +1,58 @@
+import random
+from contextlib import contextmanager
+from asgiref.local import Local
+from django.conf import settings
+
+_state = Local()
+
+
+def get_replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+
+def _use_replica():
+    return getattr(_state, 'use_replica', False) and not getattr(_state, 'wrote', False)
+
+
+def set_replica_reads(enabled):
+    _state.use_replica = enabled
+    _state.wrote = False
+
+
+@contextmanager
+def replica_reads():
+    """
+    Route reads inside the block to a replica, e.g. for reporting tasks
+    that can tolerate replica lag
+    """
+    previous = (getattr(_state, 'use_replica', False), getattr(_state, 'wrote', False))
+    set_replica_reads(True)
+    try:
+        yield
+    finally:
+        _state.use_replica, _state.wrote = previous
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to a replica when the current request or task opted in,
+    and everything else to the primary. Once a write happens, subsequent
+    reads in the same context stay on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica():
+            replicas = get_replica_aliases()
+            if replicas:
+                return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
@@ -0,0 +1,191 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from decimal import Decimal
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.utils import timezone
+from apps.core.metrics import (
+    DECISION_LOG_BUFFERED,
+    DECISION_LOG_DROPPED,
+    DECISION_LOG_FAILED,
+    DECISION_LOG_LAG,
+    DECISION_LOG_WRITTEN,
+)
+from apps.core.models import EligibilityDecision
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the database is unreachable rather than that a row is bad
+UNAVAILABLE_ERRORS = (OperationalError, InterfaceError)
+
+
+class DecisionLog:
+    """
+    Buffer eligibility decisions in memory and write them with batched
+    bulk_create from a background thread, so recording a decision costs the
+    request a queue put instead of an INSERT. The buffer is bounded:
+    decisions that do not fit are dropped and counted. Pending decisions
+    are flushed when the process exits.
+    """
+
+    def __init__(self, max_buffer, batch_size, flush_interval, max_retries):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._queue = queue.Queue(maxsize=max_buffer)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._retry_batch = []
+        self._retry_attempts = 0
+
+    def record(self, endpoint, customer_id, request_data, result, loan_id=None):
+        """Queue a decision from EligibilityService.check_eligibility without blocking"""
+        if not settings.DECISION_LOG_ENABLED:
+            return
+
+        try:
+            decision = EligibilityDecision(
+                customer_id=customer_id,
+                endpoint=endpoint,
+                loan_amount=_decimal(request_data['loan_amount']),
+                interest_rate=_decimal(request_data['interest_rate']),
+                tenure=request_data['tenure'],
+                credit_score=result['credit_score'],
+                approval=result['approval'],
+                corrected_interest_rate=_decimal(result['corrected_interest_rate']),
+                monthly_installment=_decimal(result['monthly_installment']),
+                message=result['message'],
+                rejection_reason=result['rejection_reason'] or '',
+                loan_id=loan_id,
+                decided_at=timezone.now()
+            )
+            # Reject values the table cannot hold here, so they never reach a batch
+            decision.clean_fields()
+        except (ArithmeticError, ValidationError) as e:
+            DECISION_LOG_FAILED.labels(reason='invalid').inc()
+            logger.warning('Eligibility decision for customer %s not logged: %s', customer_id, e)
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(decision)
+        except queue.Full:
+            DECISION_LOG_DROPPED.inc()
+            return
+        DECISION_LOG_BUFFERED.inc()
+
+    def flush(self):
+        """Write everything currently buffered; returns the number of decisions written"""
+        with self._lock:
+            written = 0
+            while True:
+                batch = self._retry_batch or self._take_batch()
+                if not batch:
+                    return written
+                self._retry_batch = []
+
+                written += self._write(batch)
+                if self._retry_batch:
+                    self._retry_attempts += 1
+                    if self._retry_attempts <= self.max_retries:
+                        # Database unavailable: try again on the next flush
+                        return written
+                    logger.error('Discarding %d eligibility decisions after %d retries',
+                                 len(self._retry_batch), self.max_retries)
+                    self._discard(self._retry_batch, 'retries')
+                    self._retry_batch = []
+                self._retry_attempts = 0
+
+    def shutdown(self, timeout=10):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def _ensure_started(self):
+        # Start lazily, and again in a forked child, which does not inherit threads
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='decision-log', daemon=True)
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def _take_batch(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """
+        Write a batch, falling back to one row at a time when it contains a
+        row the database rejects. Rejected rows are discarded; if the
+        database is unavailable the unwritten rows are kept in _retry_batch.
+        """
+        try:
+            self._insert(batch)
+            return len(batch)
+        except UNAVAILABLE_ERRORS:
+            logger.exception('Failed to write %d eligibility decisions', len(batch))
+            self._retry_batch = batch
+            return 0
+        except Exception:
+            if len(batch) == 1:
+                logger.exception('Discarding eligibility decision the database rejected')
+                self._discard(batch, 'error')
+                return 0
+
+        written = 0
+        for index, decision in enumerate(batch):
+            written += self._write([decision])
+            if self._retry_batch:
+                self._retry_batch += batch[index + 1:]
+                break
+        return written
+
+    def _insert(self, batch):
+        # Own transaction (or savepoint) so a rejected row leaves the connection usable
+        with transaction.atomic():
+            EligibilityDecision.objects.bulk_create(batch)
+        now = timezone.now()
+        for decision in batch:
+            DECISION_LOG_LAG.observe((now - decision.decided_at).total_seconds())
+        DECISION_LOG_BUFFERED.dec(len(batch))
+        DECISION_LOG_WRITTEN.inc(len(batch))
+
+    def _discard(self, batch, reason):
+        DECISION_LOG_BUFFERED.dec(len(batch))
+        DECISION_LOG_FAILED.labels(reason=reason).inc(len(batch))
+
+
+def _decimal(value):
+    return Decimal(str(value)).quantize(Decimal('0.01'))
+
+
+decision_log = DecisionLog(
+    max_buffer=settings.DECISION_LOG_MAX_BUFFER,
+    batch_size=settings.DECISION_LOG_BATCH_SIZE,
+    flush_interval=settings.DECISION_LOG_FLUSH_INTERVAL,
+    max_retries=settings.DECISION_LOG_MAX_RETRIES
+)
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import time
+import uuid
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from .middleware import get_client_key
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def _fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _replay(stored):
+    response = Response(stored['data'], status=stored['status'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _replay_or_reject(stored, fingerprint):
+    if stored['fingerprint'] != fingerprint:
+        return Response(
+            {'error': f'{IDEMPOTENCY_HEADER} was already used with a different request body'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return _replay(stored)
+
+
+def idempotent(view_method):
+    """
+    Honour the Idempotency-Key header on an APIView handler. The first
+    response for a (client, key) pair is stored for IDEMPOTENCY_KEY_TTL
+    seconds and replayed for later requests with the same key. A duplicate
+    arriving while the original is still running waits for its response
+    instead of repeating the work.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f'{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        scope = f'idempotency:{request.resolver_match.url_name}:{get_client_key(request)}:{key}'
+        response_key = f'{scope}:response'
+        lock_key = f'{scope}:lock'
+        fingerprint = _fingerprint(request)
+
+        stored = cache.get(response_key)
+        if stored is not None:
+            return _replay_or_reject(stored, fingerprint)
+
+        # The lock holds a token identifying this request, so a request that
+        # outlives the lock timeout does not release a lock taken by another
+        token = uuid.uuid4().hex
+        if cache.add(lock_key, token, timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT):
+            try:
+                # The original may have stored its response and released the
+                # lock between the check above and acquiring it
+                stored = cache.get(response_key)
+                if stored is not None:
+                    return _replay_or_reject(stored, fingerprint)
+
+                response = view_method(self, request, *args, **kwargs)
+                # Server errors are not stored so the client can retry them
+                if response.status_code < 500:
+                    cache.set(
+                        response_key,
+                        {
+                            'fingerprint': fingerprint,
+                            'status': response.status_code,
+                            'data': response.data
+                        },
+                        timeout=settings.IDEMPOTENCY_KEY_TTL
+                    )
+                return response
+            finally:
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(settings.IDEMPOTENCY_POLL_INTERVAL)
+            stored = cache.get(response_key)
+            if stored is not None:
+                return _replay_or_reject(stored, fingerprint)
+            if cache.get(lock_key) is None:
+                break
+
+        # The lock may have been released right after the response was stored
+        stored = cache.get(response_key)
+        if stored is not None:
+            return _replay_or_reject(stored, fingerprint)
+
+        return Response(
+            {'error': f'A request with this {IDEMPOTENCY_HEADER} is still in progress or failed; retry later'},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    return wrapper
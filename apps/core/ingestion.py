@@ -0,0 +1,97 @@
+import hashlib
+import time
+from django.conf import settings
+from django.db import transaction
+from apps.core.metrics import record_ingestion
+from apps.core.models import IngestionCheckpoint
+
+
+def file_fingerprint(file_path):
+    """SHA-256 of the file contents, so a checkpoint is only reused for the same file"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_workbook(file_path):
+    """Import openpyxl on first use so processes that never ingest skip loading it"""
+    import openpyxl
+    return openpyxl.load_workbook(file_path, read_only=True)
+
+
+def run_ingestion(task, task_name, file_path, process_batch):
+    """
+    Feed the rows of an Excel file to process_batch in batches of
+    INGESTION_BATCH_SIZE. Each batch commits together with a checkpoint of
+    the last processed row, so a retried task resumes after the last
+    committed batch instead of starting over. Progress is published through
+    the task state.
+    process_batch(rows) must return (created, updated) counts.
+    Returns: (rows created, rows updated) over the whole file
+    """
+    started = time.monotonic()
+    fingerprint = file_fingerprint(file_path)
+
+    checkpoint, _ = IngestionCheckpoint.objects.get_or_create(
+        task_name=task_name,
+        defaults={'file_fingerprint': fingerprint}
+    )
+    if checkpoint.file_fingerprint != fingerprint:
+        checkpoint.reset(fingerprint)
+        checkpoint.save()
+
+    workbook = load_workbook(file_path)
+    try:
+        sheet = workbook.active
+        total_rows = max(0, (sheet.max_row or 0) - 1)
+        start_row = checkpoint.last_row + 1
+        rows_this_run = 0
+        batch = []
+
+        def commit(last_row):
+            nonlocal rows_this_run
+            with transaction.atomic():
+                created, updated = process_batch(batch)
+                checkpoint.last_row = last_row
+                checkpoint.rows_created += created
+                checkpoint.rows_updated += updated
+                checkpoint.save()
+
+            rows_this_run += len(batch)
+            batch.clear()
+            _publish_progress(task, checkpoint.last_row - 1, total_rows, rows_this_run, started)
+
+        row_number = start_row - 1
+        for row_number, row in enumerate(
+            sheet.iter_rows(min_row=start_row, values_only=True),
+            start=start_row
+        ):
+            batch.append(row)
+            if len(batch) >= settings.INGESTION_BATCH_SIZE:
+                commit(row_number)
+
+        if batch:
+            commit(row_number)
+    finally:
+        workbook.close()
+
+    record_ingestion(task_name, rows_this_run, time.monotonic() - started)
+
+    counts = (checkpoint.rows_created, checkpoint.rows_updated)
+    checkpoint.delete()
+    return counts
+
+
+def _publish_progress(task, rows_done, total_rows, rows_this_run, started):
+    elapsed = time.monotonic() - started
+    rows_per_second = rows_this_run / elapsed if elapsed > 0 else 0.0
+    remaining = max(0, total_rows - rows_done)
+
+    task.update_state(state='PROGRESS', meta={
+        'rows_done': rows_done,
+        'total_rows': total_rows,
+        'rows_per_second': round(rows_per_second, 1),
+        'eta_seconds': round(remaining / rows_per_second) if rows_per_second else None
+    })
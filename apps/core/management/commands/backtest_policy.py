@@ -0,0 +1,111 @@
+import random
+import time
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router
+from apps.core.db_router import replica_reads
+from apps.core.services.backtest import evaluate_policy, load_features, summarize
+from apps.core.services.eligibility import EligibilityService
+from apps.core.services.policy import DEFAULT_POLICY, load_policy
+from apps.customers.models import Customer
+from apps.loans.models import Loan
+
+
+class Command(BaseCommand):
+    help = 'Backtest a candidate credit policy against the current one over the whole loan book'
+
+    def add_arguments(self, parser):
+        parser.add_argument('candidate', help='Path to the candidate policy JSON file')
+        parser.add_argument('--baseline', help='Policy JSON to compare against (default: current policy)')
+        parser.add_argument('--loan-amount', type=float, default=200000)
+        parser.add_argument('--interest-rate', type=float, default=10.5)
+        parser.add_argument('--tenure', type=int, default=24)
+        parser.add_argument(
+            '--verify-sample',
+            type=int,
+            default=0,
+            help='Check this many random customers against the live EligibilityService'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            candidate = load_policy(options['candidate'])
+            baseline = load_policy(options['baseline']) if options['baseline'] else DEFAULT_POLICY
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Invalid policy: {e}')
+
+        request = (options['loan_amount'], options['interest_rate'], options['tenure'])
+
+        started = time.perf_counter()
+        with replica_reads():
+            features = load_features(using=router.db_for_read(Loan))
+        loaded = time.perf_counter()
+
+        baseline_results = evaluate_policy(features, baseline, *request)
+        candidate_results = evaluate_policy(features, candidate, *request)
+        evaluated = time.perf_counter()
+
+        self.stdout.write(
+            f'{len(features["customer_id"]):,} customers: loaded in {loaded - started:.2f}s, '
+            f'evaluated in {evaluated - loaded:.2f}s'
+        )
+        self._report(
+            summarize(baseline_results, options['loan_amount']),
+            summarize(candidate_results, options['loan_amount'])
+        )
+
+        newly_approved = int((~baseline_results['approval'] & candidate_results['approval']).sum())
+        newly_rejected = int((baseline_results['approval'] & ~candidate_results['approval']).sum())
+        self.stdout.write(f'Newly approved: {newly_approved:,}  Newly rejected: {newly_rejected:,}')
+
+        if options['verify_sample']:
+            self._verify(features, options['verify_sample'], request, {
+                'baseline': (baseline, baseline_results),
+                'candidate': (candidate, candidate_results),
+            })
+
+    def _report(self, baseline, candidate):
+        self.stdout.write(f'{"metric":<24}{"baseline":>22}{"candidate":>22}{"delta":>22}')
+        for metric, value in baseline.items():
+            delta = candidate[metric] - value
+            if metric == 'approval_rate':
+                row = f'{value:>22.2%}{candidate[metric]:>22.2%}{delta:>+22.2%}'
+            else:
+                row = f'{value:>22,.2f}{candidate[metric]:>22,.2f}{delta:>+22,.2f}'
+            self.stdout.write(f'{metric:<24}{row}')
+
+    def _verify(self, features, sample_size, request, policies):
+        """Compare the vectorised results with the live services for a random sample"""
+        loan_amount, interest_rate, tenure = request
+        count = len(features['customer_id'])
+        indexes = random.sample(range(count), min(sample_size, count))
+        customers = Customer.objects.in_bulk(
+            [int(features['customer_id'][index]) for index in indexes]
+        )
+
+        mismatches = 0
+        for name, (policy, results) in policies.items():
+            for index in indexes:
+                customer = customers[int(features['customer_id'][index])]
+                live = EligibilityService(customer, policy).check_eligibility(
+                    loan_amount, interest_rate, tenure
+                )
+                vectorised = (
+                    int(results['credit_score'][index]),
+                    bool(results['approval'][index]),
+                    float(results['corrected_interest_rate'][index]),
+                )
+                expected = (live['credit_score'], live['approval'], float(live['corrected_interest_rate']))
+                if vectorised != expected or not np.isclose(
+                    results['monthly_installment'][index], live['monthly_installment']
+                ):
+                    mismatches += 1
+                    self.stderr.write(
+                        f'{name} customer {customer.customer_id}: live {expected}, backtest {vectorised}'
+                    )
+
+        if mismatches:
+            raise CommandError(f'{mismatches} parity mismatches against the live services')
+        self.stdout.write(self.style.SUCCESS(
+            f'Parity verified against the live services for {len(indexes)} customers'
+        ))
@@ -0,0 +1,90 @@
+import time
+import uuid
+from celery import Celery, states
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+CONFIGURATIONS = [
+    # (name, result backend, ignore_result, track_started)
+    ('ignored', None, True, False),
+    ('redis', 'redis', False, False),
+    ('redis + track started', 'redis', False, True),
+    ('django-db', 'django-db', False, False),
+    ('django-db + track started', 'django-db', False, True),
+]
+BENCHMARK_QUEUE = 'benchmark'
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure task dispatch and result-write throughput for each result '
+        'configuration, using the configured broker and backends'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=2000, help='Tasks per configuration')
+
+    def handle(self, *args, **options):
+        count = options['tasks']
+        self.stdout.write(f'{"configuration":<28}{"dispatch/s":>14}{"result writes/s":>18}')
+
+        for name, backend, ignore_result, track_started in CONFIGURATIONS:
+            app = self._make_app(backend, ignore_result)
+            task = app.tasks['benchmark.noop']
+
+            dispatch_rate = self._measure_dispatch(task, count)
+            write_rate = self._measure_result_writes(app, count, ignore_result, track_started)
+
+            write_column = 'n/a' if write_rate is None else f'{write_rate:,.0f}'
+            self.stdout.write(f'{name:<28}{dispatch_rate:>14,.0f}{write_column:>18}')
+
+            app.control.purge()
+
+    def _make_app(self, backend, ignore_result):
+        if backend == 'redis':
+            backend = settings.CELERY_RESULT_BACKEND
+            if not backend.startswith('redis'):
+                backend = settings.CELERY_BROKER_URL
+
+        app = Celery('benchmark', set_as_current=False)
+        app.conf.update(
+            broker_url=settings.CELERY_BROKER_URL,
+            result_backend=backend,
+            task_ignore_result=ignore_result,
+            task_default_queue=BENCHMARK_QUEUE,
+            result_expires=60,
+        )
+
+        @app.task(name='benchmark.noop')
+        def noop():
+            return None
+
+        return app
+
+    def _measure_dispatch(self, task, count):
+        """apply_async throughput; with stored results the client also sets up result tracking"""
+        # Warm up the broker connection outside the timed section
+        task.apply_async()
+        started = time.perf_counter()
+        for _ in range(count):
+            task.apply_async()
+        return count / (time.perf_counter() - started)
+
+    def _measure_result_writes(self, app, count, ignore_result, track_started):
+        """Replay the result writes a worker performs for each executed task"""
+        if ignore_result:
+            return None
+
+        backend = app.backend
+        task_ids = [str(uuid.uuid4()) for _ in range(count)]
+        started = time.perf_counter()
+        for task_id in task_ids:
+            if track_started:
+                backend.store_result(task_id, {'pid': 0, 'hostname': 'benchmark'}, states.STARTED)
+            backend.mark_as_done(task_id, None)
+        elapsed = time.perf_counter() - started
+
+        for task_id in task_ids:
+            backend.forget(task_id)
+
+        return count / elapsed
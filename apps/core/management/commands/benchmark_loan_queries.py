@@ -0,0 +1,121 @@
+import random
+import statistics
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+SCHEMA = 'loan_benchmark'
+FIRST_YEAR = 2010
+
+PREDICATES = {
+    'year function': (
+        'EXTRACT(YEAR FROM start_date) = %(year)s OR EXTRACT(YEAR FROM end_date) = %(year)s'
+    ),
+    'date range': (
+        '(start_date >= %(year_start)s AND start_date < %(next_year_start)s) OR '
+        '(end_date >= %(year_start)s AND end_date < %(next_year_start)s)'
+    ),
+}
+
+QUERIES = {
+    'credit score (one customer)': (
+        'SELECT COUNT(*) FROM {table} WHERE customer_id = %(customer_id)s '
+        'AND is_active AND ({predicate})'
+    ),
+    'portfolio (all customers)': 'SELECT COUNT(*) FROM {table} WHERE {predicate}',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark current-year loan queries using year functions vs date ranges, '
+        'on plain and start_date-partitioned copies of a generated loan book (PostgreSQL)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000_000, help='Number of generated loans')
+        parser.add_argument('--customers', type=int, default=1_000_000, help='Number of distinct customers')
+        parser.add_argument('--runs', type=int, default=5, help='Runs per query; the median is reported')
+        parser.add_argument('--reuse', action='store_true', help='Reuse a previously generated dataset')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated dataset afterwards')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('This benchmark requires PostgreSQL')
+
+        with connection.cursor() as cursor:
+            if not options['reuse']:
+                self._generate(cursor, options['rows'], options['customers'])
+
+            try:
+                self._run(cursor, options['customers'], options['runs'])
+            finally:
+                if not options['keep']:
+                    cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+
+    def _generate(self, cursor, rows, customers):
+        self.stdout.write(f'Generating {rows:,} loans for {customers:,} customers...')
+        current_year = timezone.now().year
+        columns = (
+            'loan_id bigint NOT NULL, customer_id integer NOT NULL, '
+            'loan_amount numeric(12, 2) NOT NULL, start_date date NOT NULL, '
+            'end_date date NOT NULL, is_active boolean NOT NULL'
+        )
+
+        cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        cursor.execute(f'CREATE SCHEMA {SCHEMA}')
+        cursor.execute(f'CREATE TABLE {SCHEMA}.plain ({columns})')
+        cursor.execute(f'CREATE TABLE {SCHEMA}.partitioned ({columns}) PARTITION BY RANGE (start_date)')
+        for year in range(FIRST_YEAR, current_year + 2):
+            cursor.execute(
+                f'CREATE TABLE {SCHEMA}.partitioned_y{year} PARTITION OF {SCHEMA}.partitioned '
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            )
+        cursor.execute(f'CREATE TABLE {SCHEMA}.partitioned_default PARTITION OF {SCHEMA}.partitioned DEFAULT')
+
+        days = (date(current_year, 12, 31) - date(FIRST_YEAR, 1, 1)).days
+        cursor.execute(
+            f"""
+            INSERT INTO {SCHEMA}.plain
+            SELECT id, 1 + (random() * (%s - 1))::int, (10000 + random() * 990000)::numeric(12, 2),
+                   start_date, start_date + (6 + (random() * 114)::int) * 30, random() < 0.3
+            FROM (
+                SELECT id, DATE '{FIRST_YEAR}-01-01' + (random() * %s)::int AS start_date
+                FROM generate_series(1, %s) AS id
+            ) AS generated
+            """,
+            [customers, days, rows]
+        )
+        cursor.execute(f'INSERT INTO {SCHEMA}.partitioned SELECT * FROM {SCHEMA}.plain')
+
+        for table in ('plain', 'partitioned'):
+            cursor.execute(f'CREATE INDEX ON {SCHEMA}.{table} (customer_id, is_active)')
+            cursor.execute(f'CREATE INDEX ON {SCHEMA}.{table} (start_date, end_date)')
+            cursor.execute(f'CREATE INDEX ON {SCHEMA}.{table} (end_date)')
+            cursor.execute(f'ANALYZE {SCHEMA}.{table}')
+
+    def _run(self, cursor, customers, runs):
+        year = timezone.now().year
+        self.stdout.write(f'{"query":<30}{"table":<14}{"predicate":<16}{"median ms":>12}')
+
+        for query_name, query in QUERIES.items():
+            for table in ('plain', 'partitioned'):
+                for predicate_name, predicate in PREDICATES.items():
+                    sql = query.format(table=f'{SCHEMA}.{table}', predicate=predicate)
+                    timings = []
+                    for _ in range(runs):
+                        params = {
+                            'year': year,
+                            'year_start': date(year, 1, 1),
+                            'next_year_start': date(year + 1, 1, 1),
+                            'customer_id': random.randint(1, customers),
+                        }
+                        cursor.execute(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}', params)
+                        plan = cursor.fetchone()[0]
+                        timings.append(plan[0]['Execution Time'])
+
+                    self.stdout.write(
+                        f'{query_name:<30}{table:<14}{predicate_name:<16}'
+                        f'{statistics.median(timings):>12.2f}'
+                    )
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.loans.partitions import ensure_loan_partitions
+
+
+class Command(BaseCommand):
+    help = 'Create yearly loans partitions ahead of time'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--years-ahead',
+            type=int,
+            default=settings.LOAN_PARTITION_YEARS_AHEAD,
+            help='Number of future years to create partitions for'
+        )
+
+    def handle(self, *args, **options):
+        partitions = ensure_loan_partitions(years_ahead=options['years_ahead'])
+        if not partitions:
+            self.stdout.write('The loans table is not partitioned; nothing to do.')
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Loans partitions in place: {", ".join(partitions)}')
+        )
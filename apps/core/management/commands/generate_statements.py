@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.statements import get_progress, new_run_id
+from apps.core.tasks import generate_statements
+
+
+class Command(BaseCommand):
+    help = 'Trigger background generation of customer loan statements, or show the progress of a run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customer-ids', type=int, nargs='+', help='Only these customers')
+        parser.add_argument('--shards', type=int, help='Number of parallel shard tasks')
+        parser.add_argument('--no-zip', action='store_true', help='Leave the statements as separate files')
+        parser.add_argument('--progress', metavar='RUN_ID', help='Show the progress of a run instead')
+
+    def handle(self, *args, **options):
+        if options['progress']:
+            progress = get_progress(options['progress'])
+            if progress['status'] is None:
+                raise CommandError(f'Unknown or expired statement run: {options["progress"]}')
+            self.stdout.write(
+                f'{progress["status"]}: {progress["done"]}/{progress["total"] or "?"} statements'
+                + (f' -> {progress["output"]}' if progress['output'] else '')
+            )
+            return
+
+        if options['shards'] is not None and options['shards'] < 1:
+            raise CommandError('--shards must be at least 1')
+
+        run_id = new_run_id()
+        result = generate_statements.delay(
+            run_id=run_id,
+            customer_ids=options['customer_ids'],
+            shards=options['shards'],
+            archive=not options['no_zip']
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Statement generation triggered. Run ID: {run_id}, Task ID: {result.id}'
+            )
+        )
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from django.core.management.base import BaseCommand, CommandError
+
+STARTUP_SCRIPT = 'import django; django.setup(); import {target}'
+
+
+def parse_importtime(output):
+    """
+    Parse `python -X importtime` output
+    Returns: (total cumulative microseconds, dict of self microseconds per top-level package)
+    """
+    total_us = 0
+    by_package = defaultdict(int)
+
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        package = name.strip().split('.')[0]
+        by_package[package] += int(self_us)
+
+        # Top-level imports are not indented; their cumulative times add up to the total
+        if not name[1:].startswith(' '):
+            total_us += int(cumulative_us)
+
+    return total_us, dict(by_package)
+
+
+def measure_startup(settings_module, target='config.wsgi'):
+    """
+    Start a fresh interpreter under -X importtime that sets up Django with
+    settings_module and imports target
+    Returns: parse_importtime() of its output
+    """
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT.format(target=target)],
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if process.returncode != 0:
+        raise CommandError(f'Startup failed:\n{process.stderr[-2000:]}')
+
+    return parse_importtime(process.stderr)
+
+
+class Command(BaseCommand):
+    help = 'Report the import-time breakdown of a cold process start'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--settings-module',
+            default=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'),
+            help='Settings module used for the measured process'
+        )
+        parser.add_argument(
+            '--target',
+            default='config.wsgi',
+            help='Module imported after django.setup(), e.g. config.wsgi or config.celery'
+        )
+        parser.add_argument('--top', type=int, default=20, help='Number of packages to list')
+        parser.add_argument(
+            '--budget-ms',
+            type=float,
+            help='Fail if the total import time exceeds this many milliseconds'
+        )
+
+    def handle(self, *args, **options):
+        total_us, by_package = measure_startup(options['settings_module'], options['target'])
+        total_ms = total_us / 1000
+
+        self.stdout.write(f'{"package":<32}{"self ms":>10}{"share":>8}')
+        ranked = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+        for package, self_us in ranked[:options['top']]:
+            share = (self_us / total_us * 100) if total_us else 0
+            self.stdout.write(f'{package:<32}{self_us / 1000:>10.1f}{share:>7.1f}%')
+        self.stdout.write(f'Total import time: {total_ms:.1f} ms ({options["settings_module"]})')
+
+        budget_ms = options['budget_ms']
+        if budget_ms is not None:
+            if total_ms > budget_ms:
+                raise CommandError(
+                    f'Import time {total_ms:.1f} ms exceeds the budget of {budget_ms:.1f} ms'
+                )
+            self.stdout.write(self.style.SUCCESS(f'Within the {budget_ms:.1f} ms budget'))
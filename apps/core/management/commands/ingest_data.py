@@ -1,3 +1,5 @@
+import time
+from celery.result import AsyncResult
 from django.core.management.base import BaseCommand
 from apps.core.tasks import ingest_all_data
 
@@ -5,6 +7,14 @@ from apps.core.tasks import ingest_all_data
 class Command(BaseCommand):
     help = 'Trigger background data ingestion from Excel files'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Follow the ingestion tasks and print their progress until they finish'
+        )
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between progress updates')
+
     def handle(self, *args, **options):
         result = ingest_all_data.delay()
         self.stdout.write(
@@ -12,3 +22,28 @@ class Command(BaseCommand):
                 f'Data ingestion triggered. Task ID: {result.id}'
             )
         )
+
+        if options['watch']:
+            tasks = result.get()['tasks']
+            self._watch({name: AsyncResult(task_id) for name, task_id in tasks.items()}, options['interval'])
+
+    def _watch(self, results, interval):
+        while True:
+            for name, result in results.items():
+                self.stdout.write(f'{name}: {self._describe(result)}')
+
+            if all(result.ready() for result in results.values()):
+                return
+            time.sleep(interval)
+
+    def _describe(self, result):
+        if result.state == 'PROGRESS':
+            info = result.info
+            eta = f'{info["eta_seconds"]}s' if info['eta_seconds'] is not None else 'unknown'
+            return (
+                f'{info["rows_done"]}/{info["total_rows"]} rows, '
+                f'{info["rows_per_second"]} rows/s, ETA {eta}'
+            )
+        if result.successful():
+            return f'done {result.result}'
+        return result.state
@@ -0,0 +1,163 @@
+import os
+import time
+from contextlib import ExitStack
+from django.db import connections
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Request latency by URL name',
+    ['url_name', 'method', 'status']
+)
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_duration_seconds',
+    'Time spent in database queries per request',
+    ['url_name'],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, float('inf'))
+)
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Database queries per request',
+    ['url_name'],
+    buckets=(1, 2, 5, 10, 20, 50, 100, float('inf'))
+)
+ELIGIBILITY_DECISIONS = Counter(
+    'eligibility_decisions_total',
+    'Eligibility decisions by outcome and rejection reason',
+    ['approved', 'reason']
+)
+SINGLEFLIGHT_CALLS = Counter(
+    'singleflight_calls_total',
+    'Calls through a SingleFlight, executed or coalesced into an in-flight call',
+    ['name', 'outcome']
+)
+INGESTION_DURATION = Histogram(
+    'ingestion_task_duration_seconds',
+    'Duration of ingestion tasks',
+    ['task'],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, float('inf'))
+)
+INGESTION_ROWS = Counter(
+    'ingestion_rows_total',
+    'Rows processed by ingestion tasks',
+    ['task']
+)
+INGESTION_ROWS_PER_SECOND = Gauge(
+    'ingestion_rows_per_second',
+    'Throughput of the most recent ingestion run',
+    ['task'],
+    multiprocess_mode='mostrecent'
+)
+DECISION_LOG_BUFFERED = Gauge(
+    'decision_log_buffered',
+    'Eligibility decisions waiting to be written',
+    multiprocess_mode='livesum'
+)
+DECISION_LOG_WRITTEN = Counter(
+    'decision_log_written_total',
+    'Eligibility decisions written to the decision log'
+)
+DECISION_LOG_DROPPED = Counter(
+    'decision_log_dropped_total',
+    'Eligibility decisions dropped because the buffer was full'
+)
+DECISION_LOG_FAILED = Counter(
+    'decision_log_failed_total',
+    'Eligibility decisions that could not be written, by reason',
+    ['reason']
+)
+DECISION_LOG_LAG = Histogram(
+    'decision_log_lag_seconds',
+    'Delay between a decision and its write to the decision log',
+    buckets=(.1, .25, .5, 1, 2.5, 5, 10, 30, 60, float('inf'))
+)
+
+
+def record_eligibility_decision(result):
+    ELIGIBILITY_DECISIONS.labels(
+        approved=str(result['approval']).lower(),
+        reason=result['rejection_reason'] or 'none'
+    ).inc()
+
+
+def record_ingestion(task_name, rows, duration):
+    INGESTION_DURATION.labels(task=task_name).observe(duration)
+    INGESTION_ROWS.labels(task=task_name).inc(rows)
+    if duration > 0:
+        INGESTION_ROWS_PER_SECOND.labels(task=task_name).set(rows / duration)
+
+
+def mark_process_dead(pid):
+    """Drop live gauges of an exited gunicorn or Celery child process"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
+
+
+def connect_worker_signals():
+    from celery.signals import worker_process_shutdown
+
+    def on_worker_process_shutdown(**kwargs):
+        mark_process_dead(os.getpid())
+
+    worker_process_shutdown.connect(on_worker_process_shutdown, weak=False)
+
+
+def metrics_view(request):
+    """
+    Expose metrics in the Prometheus text format. When PROMETHEUS_MULTIPROC_DIR
+    is set, samples written by every gunicorn and Celery process are merged.
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """Record latency and database time for every request, labelled by URL name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        db_time = [0.0, 0]
+
+        def record_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db_time[0] += time.perf_counter() - started
+                db_time[1] += 1
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(record_query))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        url_name = (resolver_match and resolver_match.url_name) or 'unmatched'
+
+        REQUEST_LATENCY.labels(
+            url_name=url_name,
+            method=request.method,
+            status=response.status_code
+        ).observe(duration)
+        REQUEST_DB_TIME.labels(url_name=url_name).observe(db_time[0])
+        REQUEST_DB_QUERIES.labels(url_name=url_name).observe(db_time[1])
+
+        return response
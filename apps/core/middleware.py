@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.cache import cache
+from .db_router import get_replica_aliases, set_replica_reads
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def get_client_key(request):
+    """Identify the calling client, preferring an explicit X-Client-Id header"""
+    client_id = request.headers.get('X-Client-Id')
+    if client_id:
+        return f'id:{client_id}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route the reads of read-only endpoints to a replica. After a client
+    performs a successful write, its reads stay on the primary for
+    DATABASE_REPLICA_LAG_TOLERANCE seconds so it can read its own writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            set_replica_reads(False)
+
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and not self._is_read_only(request)
+            and self._stickiness_enabled()
+        ):
+            cache.set(
+                self._pin_key(request),
+                1,
+                timeout=settings.DATABASE_REPLICA_LAG_TOLERANCE
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self._is_read_only(request) and not self._is_pinned(request):
+            set_replica_reads(True)
+        return None
+
+    def _is_read_only(self, request):
+        resolver_match = getattr(request, 'resolver_match', None)
+        return (
+            resolver_match is not None
+            and resolver_match.url_name in settings.DATABASE_REPLICA_URL_NAMES
+        )
+
+    def _stickiness_enabled(self):
+        return settings.DATABASE_REPLICA_LAG_TOLERANCE > 0 and bool(get_replica_aliases())
+
+    def _is_pinned(self, request):
+        return self._stickiness_enabled() and cache.get(self._pin_key(request)) is not None
+
+    def _pin_key(self, request):
+        return f'db-pin:{get_client_key(request)}'
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.9
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EligibilityDecision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('customer_id', models.IntegerField()),
+                ('endpoint', models.CharField(max_length=50)),
+                ('loan_amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('interest_rate', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('tenure', models.IntegerField()),
+                ('credit_score', models.IntegerField()),
+                ('approval', models.BooleanField()),
+                ('corrected_interest_rate', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('monthly_installment', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('message', models.CharField(blank=True, max_length=255)),
+                ('rejection_reason', models.CharField(blank=True, max_length=50)),
+                ('loan_id', models.IntegerField(blank=True, null=True)),
+                ('decided_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'eligibility_decisions',
+                'indexes': [models.Index(fields=['customer_id', 'decided_at'], name='eligibility_custome_3ea79e_idx'), models.Index(fields=['decided_at'], name='eligibility_decided_1e6d55_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import models
+
+
+class IngestionCheckpoint(models.Model):
+    task_name = models.CharField(max_length=100, unique=True)
+    file_fingerprint = models.CharField(max_length=64)
+    last_row = models.IntegerField(default=1)
+    rows_created = models.IntegerField(default=0)
+    rows_updated = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ingestion_checkpoints'
+
+    def __str__(self):
+        return f"{self.task_name} at row {self.last_row}"
+
+    def reset(self, file_fingerprint):
+        self.file_fingerprint = file_fingerprint
+        self.last_row = 1
+        self.rows_created = 0
+        self.rows_updated = 0
+
+
+class EligibilityDecision(models.Model):
+    customer_id = models.IntegerField()
+    endpoint = models.CharField(max_length=50)
+    loan_amount = models.DecimalField(max_digits=12, decimal_places=2)
+    interest_rate = models.DecimalField(max_digits=5, decimal_places=2)
+    tenure = models.IntegerField()
+    credit_score = models.IntegerField()
+    approval = models.BooleanField()
+    corrected_interest_rate = models.DecimalField(max_digits=5, decimal_places=2)
+    monthly_installment = models.DecimalField(max_digits=12, decimal_places=2)
+    message = models.CharField(max_length=255, blank=True)
+    rejection_reason = models.CharField(max_length=50, blank=True)
+    loan_id = models.IntegerField(null=True, blank=True)
+    decided_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'eligibility_decisions'
+        indexes = [
+            models.Index(fields=['customer_id', 'decided_at']),
+            models.Index(fields=['decided_at']),
+        ]
+
+    def __str__(self):
+        outcome = 'approved' if self.approval else 'rejected'
+        return f"Decision for Customer {self.customer_id} ({outcome})"
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses the planner's row estimate instead of COUNT(*) for
+    unfiltered querysets on large PostgreSQL tables. Autovacuum never
+    analyzes a partitioned parent table, so for those the estimates of its
+    partitions are summed.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT CASE WHEN parent.relkind = 'p' THEN (
+                        SELECT SUM(GREATEST(child.reltuples, 0))
+                        FROM pg_inherits
+                        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                        WHERE pg_inherits.inhparent = parent.oid
+                    ) ELSE parent.reltuples END
+                    FROM pg_class parent WHERE parent.oid = %s::regclass
+                    """,
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+
+            if row and row[0] is not None and row[0] >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return int(row[0])
+
+        return super().count
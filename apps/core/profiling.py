@@ -0,0 +1,153 @@
+import cProfile
+import json
+import random
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+PROFILING_SALT = 'apps.core.profiling'
+PROFILING_HEADER = 'X-Profile-Token'
+
+
+def make_profiling_token():
+    """Create a signed token that enables profiling when sent in X-Profile-Token"""
+    return signing.TimestampSigner(salt=PROFILING_SALT).sign('profile')
+
+
+def is_valid_profiling_token(token):
+    try:
+        signing.TimestampSigner(salt=PROFILING_SALT).unsign(
+            token,
+            max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def should_sample():
+    rate = settings.PROFILING_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+class Profiler:
+    """
+    Capture a cProfile profile and the SQL timeline of a block of work and
+    write them to PROFILING_DIR as <label>.prof (pstats) and <label>.sql.json
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.queries = []
+        self._profile = cProfile.Profile()
+        self._stack = ExitStack()
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        for connection in connections.all():
+            self._stack.enter_context(
+                connection.execute_wrapper(self._record_query(connection.alias))
+            )
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self._stack.close()
+        return self._write(time.perf_counter() - self._started)
+
+    def _record_query(self, alias):
+        def wrapper(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries.append({
+                    'database': alias,
+                    'start_ms': round((started - self._started) * 1000, 3),
+                    'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+                    'sql': sql,
+                    'many': many
+                })
+        return wrapper
+
+    def _write(self, duration):
+        output_dir = settings.PROFILING_DIR
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        stamp = timezone.now().strftime('%Y%m%dT%H%M%S%f')
+        base_path = output_dir / f'{stamp}-{self.label}'
+
+        self._profile.dump_stats(f'{base_path}.prof')
+        with open(f'{base_path}.sql.json', 'w') as sql_file:
+            json.dump({
+                'label': self.label,
+                'duration_ms': round(duration * 1000, 3),
+                'query_count': len(self.queries),
+                'query_time_ms': round(sum(q['duration_ms'] for q in self.queries), 3),
+                'queries': self.queries
+            }, sql_file, indent=2)
+
+        return base_path
+
+
+class ProfilingMiddleware:
+    """
+    Profile a request when it carries a valid signed X-Profile-Token header
+    or is picked by PROFILING_SAMPLE_RATE. Removed from the middleware chain
+    entirely unless PROFILING_ENABLED is set.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = request.headers.get(PROFILING_HEADER)
+        if not ((token and is_valid_profiling_token(token)) or should_sample()):
+            return self.get_response(request)
+
+        label = request.path.strip('/').replace('/', '_') or 'root'
+        profiler = Profiler(f'{request.method.lower()}-{label}')
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            base_path = profiler.stop()
+
+        response['X-Profile-Id'] = base_path.name
+        return response
+
+
+_task_profilers = {}
+
+
+def _task_prerun(task_id=None, task=None, **kwargs):
+    if should_sample() or getattr(task.request, 'profile', False):
+        profiler = Profiler(f'task-{task.name}-{task_id}')
+        _task_profilers[task_id] = profiler
+        profiler.start()
+
+
+def _task_postrun(task_id=None, **kwargs):
+    profiler = _task_profilers.pop(task_id, None)
+    if profiler is not None:
+        profiler.stop()
+
+
+def connect_task_signals():
+    """
+    Profile sampled Celery tasks, and tasks sent with a profile=True header,
+    e.g. task.apply_async(headers={'profile': True})
+    """
+    if not settings.PROFILING_ENABLED:
+        return
+
+    from celery.signals import task_prerun, task_postrun
+    task_prerun.connect(_task_prerun, weak=False)
+    task_postrun.connect(_task_postrun, weak=False)
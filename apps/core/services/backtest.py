@@ -0,0 +1,194 @@
+from datetime import date
+import numpy as np
+from django.db import connections
+from django.utils import timezone
+from .emi_calculator import EMICalculator
+
+FEATURE_COLUMNS = [
+    'customer_id',
+    'monthly_salary',
+    'approved_limit',
+    'loan_count',
+    'total_tenure',
+    'total_emis_on_time',
+    'total_amount',
+    'active_amount',
+    'active_emis',
+    'current_year_count',
+    'current_year_active_count',
+]
+
+# One pass over the loan book, aggregated per customer. Every input of the
+# credit score and eligibility rules is one of these per-customer columns,
+# cast to double precision so rows arrive as floats rather than Decimals.
+FEATURES_SQL = """
+    SELECT c.customer_id,
+           CAST(c.monthly_salary AS double precision),
+           CAST(c.approved_limit AS double precision),
+           COALESCE(l.loan_count, 0),
+           COALESCE(l.total_tenure, 0),
+           COALESCE(l.total_emis_on_time, 0),
+           CAST(COALESCE(l.total_amount, 0) AS double precision),
+           CAST(COALESCE(l.active_amount, 0) AS double precision),
+           CAST(COALESCE(l.active_emis, 0) AS double precision),
+           COALESCE(l.current_year_count, 0),
+           COALESCE(l.current_year_active_count, 0)
+    FROM customers c
+    LEFT JOIN (
+        SELECT customer_id,
+               COUNT(*) AS loan_count,
+               SUM(tenure) AS total_tenure,
+               SUM(emis_paid_on_time) AS total_emis_on_time,
+               SUM(loan_amount) AS total_amount,
+               SUM(CASE WHEN is_active THEN loan_amount ELSE 0 END) AS active_amount,
+               SUM(CASE WHEN is_active THEN monthly_repayment ELSE 0 END) AS active_emis,
+               SUM(CASE WHEN {current_year} THEN 1 ELSE 0 END) AS current_year_count,
+               SUM(CASE WHEN {current_year} AND is_active THEN 1 ELSE 0 END) AS current_year_active_count
+        FROM loans
+        GROUP BY customer_id
+    ) l ON l.customer_id = c.customer_id
+    ORDER BY c.customer_id
+"""
+CURRENT_YEAR_SQL = (
+    '((start_date >= %(year_start)s AND start_date < %(next_year_start)s) OR '
+    '(end_date >= %(year_start)s AND end_date < %(next_year_start)s))'
+)
+
+
+def load_features(using='default', chunk_size=100000):
+    """
+    Load the per-customer loan book aggregates into columnar numpy arrays
+    Returns: dict of column name -> array, one entry per customer
+    """
+    year = timezone.now().year
+    params = {
+        'year_start': date(year, 1, 1),
+        'next_year_start': date(year + 1, 1, 1),
+    }
+    sql = FEATURES_SQL.format(current_year=CURRENT_YEAR_SQL)
+
+    chunks = []
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            chunks.append(np.array(rows, dtype=np.float64))
+
+    matrix = np.concatenate(chunks) if chunks else np.empty((0, len(FEATURE_COLUMNS)))
+    return {name: matrix[:, index] for index, name in enumerate(FEATURE_COLUMNS)}
+
+
+def _band_points(values, bands, default_points, at_least=False):
+    points = np.full(values.shape, float(default_points))
+    assigned = np.zeros(values.shape, dtype=bool)
+    for limit, band in bands:
+        matches = ~assigned & ((values >= limit) if at_least else (values <= limit))
+        points[matches] = band
+        assigned |= matches
+    return points
+
+
+def score_customers(features, policy):
+    """Vectorised CreditScoreCalculator.calculate for every customer"""
+    loan_count = features['loan_count']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        on_time_percentage = np.where(
+            features['total_tenure'] > 0,
+            features['total_emis_on_time'] / features['total_tenure'] * 100,
+            0.0
+        )
+    score = on_time_percentage * policy['payment_history_weight']
+
+    score += _band_points(loan_count, policy['loan_count_bands'], policy['loan_count_default_points'])
+
+    active = features['current_year_active_count']
+    max_active = policy['current_year_max_active']
+    current_year_points = np.select(
+        [
+            features['current_year_count'] == 0,
+            (active >= 1) & (active <= max_active),
+            active > max_active,
+        ],
+        [
+            policy['no_current_year_points'],
+            policy['current_year_active_points'],
+            policy['current_year_over_active_points'],
+        ],
+        default=0
+    )
+    score += current_year_points
+
+    score += _band_points(
+        features['total_amount'],
+        policy['loan_volume_bands'],
+        policy['loan_volume_default_points'],
+        at_least=True
+    )
+
+    score = np.where(features['active_amount'] > features['approved_limit'], 0, score)
+    score = np.round(np.clip(score, 0, 100))
+
+    return np.where(loan_count == 0, policy['no_history_score'], score)
+
+
+def evaluate_policy(features, policy, loan_amount, interest_rate, tenure):
+    """
+    Vectorised EligibilityService.check_eligibility of one loan request for
+    every customer
+    Returns: dict of arrays (credit_score, approval, corrected_interest_rate,
+    monthly_installment, rejection_reason)
+    """
+    credit_score = score_customers(features, policy)
+    requested_emi = EMICalculator.calculate_emi(loan_amount, interest_rate, tenure)
+
+    rejected_score = credit_score <= policy['reject_score']
+    over_emi_limit = (
+        features['active_emis'] + requested_emi
+        > policy['max_emi_salary_ratio'] * features['monthly_salary']
+    )
+    approval = ~rejected_score & ~over_emi_limit
+
+    corrected_rate = np.full(credit_score.shape, float(interest_rate))
+    monthly_installment = np.full(credit_score.shape, float(requested_emi))
+    assigned = np.zeros(credit_score.shape, dtype=bool)
+    for threshold, floor in policy['rate_floors']:
+        band = ~assigned & (credit_score > threshold)
+        assigned |= band
+        if floor is None or floor <= interest_rate:
+            continue
+        band &= approval
+        corrected_rate[band] = floor
+        monthly_installment[band] = EMICalculator.calculate_emi(loan_amount, floor, tenure)
+
+    rejection_reason = np.where(
+        rejected_score, 'credit_score', np.where(over_emi_limit, 'emi_limit', '')
+    )
+
+    return {
+        'credit_score': credit_score,
+        'approval': approval,
+        'corrected_interest_rate': corrected_rate,
+        'monthly_installment': monthly_installment,
+        'rejection_reason': rejection_reason,
+    }
+
+
+def summarize(results, loan_amount):
+    approval = results['approval']
+    count = len(approval)
+    approved = int(approval.sum())
+    return {
+        'customers': count,
+        'approved': approved,
+        'approval_rate': approved / count if count else 0.0,
+        'exposure': approved * float(loan_amount),
+        'monthly_installments': float(results['monthly_installment'][approval].sum()),
+        'rejected_credit_score': int((results['rejection_reason'] == 'credit_score').sum()),
+        'rejected_emi_limit': int((results['rejection_reason'] == 'emi_limit').sum()),
+        'mean_corrected_rate': (
+            float(results['corrected_interest_rate'][approval].mean()) if approved else 0.0
+        ),
+    }
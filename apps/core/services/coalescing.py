@@ -0,0 +1,118 @@
+import threading
+import time
+import uuid
+from django.core.cache import cache
+from apps.core.metrics import SINGLEFLIGHT_CALLS
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into a single execution.
+    Callers arriving while a call for the same key is in flight wait for it
+    and receive its result. With use_cache enabled, a cache lock extends this
+    across worker processes. Results are only shared with callers that
+    overlapped the call; result_ttl just bounds how long waiters in other
+    processes have to pick the result up.
+    """
+
+    def __init__(self, name, use_cache=False, timeout=5, result_ttl=2, poll_interval=0.02):
+        self.name = name
+        self.use_cache = use_cache
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.executed_count = 0
+        self.coalesced_count = 0
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Run fn() once per key among concurrent callers and share its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self._coalesced()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._execute(key, fn)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'executed': self.executed_count,
+                'coalesced': self.coalesced_count,
+                'in_flight': len(self._calls)
+            }
+
+    def _run(self, fn):
+        with self._lock:
+            self.executed_count += 1
+        SINGLEFLIGHT_CALLS.labels(name=self.name, outcome='executed').inc()
+        return fn()
+
+    def _coalesced(self):
+        # Callers hold self._lock
+        self.coalesced_count += 1
+        SINGLEFLIGHT_CALLS.labels(name=self.name, outcome='coalesced').inc()
+
+    def _execute(self, key, fn):
+        if not self.use_cache:
+            return self._run(fn)
+
+        lock_key = f'singleflight:{self.name}:{key}:lock'
+        result_key = f'singleflight:{self.name}:{key}:result'
+
+        # The lock holds a token identifying the call, and the result is
+        # stored with it so waiters never pick up an earlier call's result
+        token = uuid.uuid4().hex
+        if cache.add(lock_key, token, timeout=self.timeout):
+            try:
+                result = self._run(fn)
+                cache.set(result_key, (token, result), timeout=self.result_ttl)
+                return result
+            finally:
+                cache.delete(lock_key)
+
+        # Another process holds the lock: wait for its result, and fall back
+        # to computing locally if it fails or takes longer than the timeout
+        token = cache.get(lock_key)
+        deadline = time.monotonic() + self.timeout
+        while token is not None and time.monotonic() < deadline:
+            # Read the lock first: the result is stored before it is released
+            in_flight = cache.get(lock_key) == token
+            stored = cache.get(result_key)
+            if stored is not None and stored[0] == token:
+                with self._lock:
+                    self._coalesced()
+                return stored[1]
+            if not in_flight:
+                break
+            time.sleep(self.poll_interval)
+
+        return self._run(fn)
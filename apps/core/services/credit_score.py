@@ -1,11 +1,14 @@
+from datetime import date
 from django.db.models import Sum, Q
 from django.utils import timezone
 from apps.loans.models import Loan
+from .policy import DEFAULT_POLICY, band_points
 
 
 class CreditScoreCalculator:
-    def __init__(self, customer):
+    def __init__(self, customer, policy=None):
         self.customer = customer
+        self.policy = policy or DEFAULT_POLICY
         self.score = 0
 
     def calculate(self):
@@ -15,7 +18,7 @@ class CreditScoreCalculator:
         past_loans = Loan.objects.filter(customer=self.customer)
 
         if not past_loans.exists():
-            return 50
+            return self.policy['no_history_score']
 
         self._evaluate_payment_history(past_loans)
         self._evaluate_number_of_loans(past_loans)
@@ -37,36 +40,37 @@ class CreditScoreCalculator:
 
         if total_emis > 0:
             on_time_percentage = (on_time_emis / total_emis) * 100
-            self.score += (on_time_percentage * 0.4)
+            self.score += (on_time_percentage * self.policy['payment_history_weight'])
 
     def _evaluate_number_of_loans(self, past_loans):
         """Factor 2: Number of loans taken (20 points max)"""
         loan_count = past_loans.count()
-
-        if loan_count <= 2:
-            self.score += 20
-        elif loan_count <= 5:
-            self.score += 15
-        elif loan_count <= 10:
-            self.score += 10
-        else:
-            self.score += 5
+        self.score += band_points(
+            loan_count,
+            self.policy['loan_count_bands'],
+            self.policy['loan_count_default_points']
+        )
 
     def _evaluate_current_year_activity(self, past_loans):
         """Factor 3: Loan activity in current year (20 points max)"""
         current_year = timezone.now().year
+        year_start = date(current_year, 1, 1)
+        next_year_start = date(current_year + 1, 1, 1)
+        # Plain date ranges keep the predicates sargable for the
+        # (start_date, end_date) index and start_date partition pruning
         current_year_loans = past_loans.filter(
-            Q(start_date__year=current_year) | Q(end_date__year=current_year)
+            Q(start_date__gte=year_start, start_date__lt=next_year_start) |
+            Q(end_date__gte=year_start, end_date__lt=next_year_start)
         )
 
         if current_year_loans.exists():
-            active_loans = current_year_loans.filter(is_active=True)
-            if active_loans.count() >= 1 and active_loans.count() <= 3:
-                self.score += 20
-            elif active_loans.count() > 3:
-                self.score += 10
+            active_count = current_year_loans.filter(is_active=True).count()
+            if 1 <= active_count <= self.policy['current_year_max_active']:
+                self.score += self.policy['current_year_active_points']
+            elif active_count > self.policy['current_year_max_active']:
+                self.score += self.policy['current_year_over_active_points']
         else:
-            self.score += 5
+            self.score += self.policy['no_current_year_points']
 
     def _evaluate_loan_volume(self, past_loans):
         """Factor 4: Total loan approved volume (20 points max)"""
@@ -74,14 +78,12 @@ class CreditScoreCalculator:
             total=Sum('loan_amount')
         )['total'] or 0
 
-        if total_volume >= 1000000:
-            self.score += 20
-        elif total_volume >= 500000:
-            self.score += 15
-        elif total_volume >= 100000:
-            self.score += 10
-        else:
-            self.score += 5
+        self.score += band_points(
+            total_volume,
+            self.policy['loan_volume_bands'],
+            self.policy['loan_volume_default_points'],
+            at_least=True
+        )
 
     def _evaluate_current_loans_vs_limit(self):
         """Factor 5: Current loans vs approved limit - Critical factor"""
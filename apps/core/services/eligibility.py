@@ -1,19 +1,31 @@
+from django.conf import settings
 from django.db.models import Sum
 from apps.loans.models import Loan
+from .coalescing import SingleFlight
 from .credit_score import CreditScoreCalculator
 from .emi_calculator import EMICalculator
+from .policy import DEFAULT_POLICY
+
+
+eligibility_flight = SingleFlight(
+    'eligibility',
+    use_cache=settings.ELIGIBILITY_COALESCE_ACROSS_WORKERS,
+    timeout=settings.ELIGIBILITY_COALESCE_TIMEOUT,
+    result_ttl=settings.ELIGIBILITY_COALESCE_RESULT_TTL
+)
 
 
 class EligibilityService:
-    def __init__(self, customer):
+    def __init__(self, customer, policy=None):
         self.customer = customer
+        self.policy = policy or DEFAULT_POLICY
 
     def check_eligibility(self, loan_amount, interest_rate, tenure):
         """
         Check loan eligibility based on credit score and various factors
         Returns: dict with approval status, corrected_interest_rate, monthly_installment
         """
-        credit_score_calculator = CreditScoreCalculator(self.customer)
+        credit_score_calculator = CreditScoreCalculator(self.customer, self.policy)
         credit_score = credit_score_calculator.calculate()
 
         monthly_installment = EMICalculator.calculate_emi(
@@ -27,18 +39,24 @@ class EligibilityService:
             'corrected_interest_rate': interest_rate,
             'monthly_installment': monthly_installment,
             'message': '',
+            'rejection_reason': None,
             'credit_score': credit_score
         }
 
-        if credit_score <= 10:
+        if credit_score <= self.policy['reject_score']:
             result['message'] = 'Credit score too low. Loan rejected.'
+            result['rejection_reason'] = 'credit_score'
             return result
 
         current_emis_sum = self._calculate_current_emis()
         monthly_salary = float(self.customer.monthly_salary)
 
-        if current_emis_sum + monthly_installment > (0.5 * monthly_salary):
-            result['message'] = 'Sum of current EMIs exceeds 50% of monthly salary. Loan rejected.'
+        max_emi_ratio = self.policy['max_emi_salary_ratio']
+        if current_emis_sum + monthly_installment > (max_emi_ratio * monthly_salary):
+            result['message'] = (
+                f'Sum of current EMIs exceeds {max_emi_ratio:.0%} of monthly salary. Loan rejected.'
+            )
+            result['rejection_reason'] = 'emi_limit'
             return result
 
         corrected_rate = self._determine_corrected_interest_rate(credit_score, interest_rate)
@@ -57,6 +75,17 @@ class EligibilityService:
 
         return result
 
+    def check_eligibility_coalesced(self, loan_amount, interest_rate, tenure):
+        """
+        Same as check_eligibility, but concurrent identical checks for this
+        customer share a single computation
+        """
+        key = f'{self.customer.customer_id}:{loan_amount}:{interest_rate}:{tenure}'
+        return eligibility_flight.do(
+            key,
+            lambda: self.check_eligibility(loan_amount, interest_rate, tenure)
+        )
+
     def _calculate_current_emis(self):
         """Calculate sum of all current active EMIs"""
         current_loans = Loan.objects.filter(
@@ -73,16 +102,12 @@ class EligibilityService:
     def _determine_corrected_interest_rate(self, credit_score, requested_rate):
         """
         Determine the corrected interest rate based on credit score
-        Rules:
+        Default rules:
         - credit_score > 50: approve at requested rate
         - 30 < credit_score <= 50: approve only if rate > 12%, else correct to 12%
         - 10 < credit_score <= 30: approve only if rate > 16%, else correct to 16%
         """
-        if credit_score > 50:
-            return requested_rate
-        elif credit_score > 30:
-            return max(12.0, requested_rate)
-        elif credit_score > 10:
-            return max(16.0, requested_rate)
-        else:
-            return requested_rate
+        for threshold, floor in self.policy['rate_floors']:
+            if credit_score > threshold:
+                return requested_rate if floor is None else max(floor, requested_rate)
+        return requested_rate
@@ -0,0 +1,46 @@
+import json
+
+# Credit policy shared by the live services and the backtesting engine.
+# Band lists are (limit, points) pairs evaluated in order; the first match wins.
+DEFAULT_POLICY = {
+    # Score given to customers without any loans
+    'no_history_score': 50,
+    # Points per percent of EMIs paid on time
+    'payment_history_weight': 0.4,
+    # loan_count <= limit
+    'loan_count_bands': [(2, 20), (5, 15), (10, 10)],
+    'loan_count_default_points': 5,
+    # Loans starting or ending in the current year
+    'current_year_max_active': 3,
+    'current_year_active_points': 20,
+    'current_year_over_active_points': 10,
+    'no_current_year_points': 5,
+    # total loan_amount >= threshold
+    'loan_volume_bands': [(1000000, 20), (500000, 15), (100000, 10)],
+    'loan_volume_default_points': 5,
+    # Scores at or below this are rejected
+    'reject_score': 10,
+    # credit_score > threshold -> minimum interest rate (None keeps the requested rate)
+    'rate_floors': [(50, None), (30, 12.0), (10, 16.0)],
+    # Maximum share of monthly salary taken by current EMIs plus the new one
+    'max_emi_salary_ratio': 0.5,
+}
+
+
+def load_policy(path):
+    """Load a policy JSON file; keys it leaves out keep their DEFAULT_POLICY values"""
+    with open(path) as policy_file:
+        overrides = json.load(policy_file)
+
+    unknown = set(overrides) - set(DEFAULT_POLICY)
+    if unknown:
+        raise ValueError(f'Unknown policy keys: {", ".join(sorted(unknown))}')
+
+    return {**DEFAULT_POLICY, **overrides}
+
+
+def band_points(value, bands, default_points, at_least=False):
+    for limit, points in bands:
+        if (value >= limit) if at_least else (value <= limit):
+            return points
+    return default_points
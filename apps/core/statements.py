@@ -0,0 +1,155 @@
+import uuid
+import zipfile
+from itertools import groupby
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Min
+from django.utils import timezone
+from apps.loans.models import Loan
+
+STATEMENT_HEADER = [
+    'Loan ID',
+    'Loan Amount',
+    'Interest Rate',
+    'Tenure',
+    'Monthly Installment',
+    'EMIs Paid On Time',
+    'Repayments Left',
+    'Start Date',
+    'End Date',
+    'Active',
+]
+PROGRESS_TTL = 7 * 24 * 60 * 60
+
+
+def new_run_id():
+    return f'{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}'
+
+
+def run_dir(run_id):
+    return settings.STATEMENTS_DIR / run_id
+
+
+def build_shards(customer_ids=None, shard_count=1):
+    """
+    Split the customers to process into shard specs: contiguous customer_id
+    ranges for a full run, or slices of an explicit customer_ids list
+    """
+    if shard_count < 1:
+        raise ValueError(f'shard_count must be at least 1, got {shard_count}')
+
+    if customer_ids:
+        ids = sorted(set(customer_ids))
+        size = -(-len(ids) // shard_count)
+        return [{'customer_ids': ids[i:i + size]} for i in range(0, len(ids), size)]
+
+    bounds = Loan.objects.aggregate(first=Min('customer_id'), last=Max('customer_id'))
+    if bounds['first'] is None:
+        return []
+
+    first, last = bounds['first'], bounds['last'] + 1
+    size = -(-(last - first) // shard_count)
+    return [
+        {'id_range': [start, min(start + size, last)]}
+        for start in range(first, last, size)
+    ]
+
+
+def shard_loans(shard):
+    """A single query over the shard's loans, ordered so each customer's loans are contiguous"""
+    loans = Loan.objects.select_related('customer').order_by('customer_id', 'loan_id')
+    if 'customer_ids' in shard:
+        return loans.filter(customer_id__in=shard['customer_ids'])
+    start, end = shard['id_range']
+    return loans.filter(customer_id__gte=start, customer_id__lt=end)
+
+
+def count_customers(shards):
+    return sum(
+        shard_loans(shard).order_by().values('customer_id').distinct().count()
+        for shard in shards
+    )
+
+
+def iter_customer_loans(loans, chunk_size=2000):
+    """Stream (customer, loans) pairs; only one customer's loans are held at a time"""
+    for _, group in groupby(loans.iterator(chunk_size=chunk_size), key=lambda loan: loan.customer_id):
+        customer_loans = list(group)
+        yield customer_loans[0].customer, customer_loans
+
+
+def write_statement(path, customer, loans, statement_date):
+    """Write one customer's statement with openpyxl's write-only (streaming) workbook"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Statement')
+    sheet.append(['Customer ID', customer.customer_id])
+    sheet.append(['Name', f'{customer.first_name} {customer.last_name}'])
+    sheet.append(['Statement Date', statement_date])
+    sheet.append([])
+    sheet.append(STATEMENT_HEADER)
+
+    for loan in loans:
+        sheet.append([
+            loan.loan_id,
+            loan.loan_amount,
+            loan.interest_rate,
+            loan.tenure,
+            loan.monthly_repayment,
+            loan.emis_paid_on_time,
+            loan.repayments_left,
+            loan.start_date,
+            loan.end_date,
+            loan.is_active,
+        ])
+
+    workbook.save(path)
+
+
+def archive_statements(run_id):
+    """Zip a run's statements one file at a time and return the archive path"""
+    directory = run_dir(run_id)
+    archive_path = settings.STATEMENTS_DIR / f'{run_id}.zip'
+    with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(directory.glob('*.xlsx')):
+            archive.write(path, arcname=f'{run_id}/{path.name}')
+    return archive_path
+
+
+def _progress_key(run_id, field):
+    return f'statements:{run_id}:{field}'
+
+
+def start_progress(run_id, total):
+    cache.set_many({
+        _progress_key(run_id, 'total'): total,
+        _progress_key(run_id, 'done'): 0,
+        _progress_key(run_id, 'status'): 'running',
+        _progress_key(run_id, 'started'): timezone.now().timestamp(),
+    }, timeout=PROGRESS_TTL)
+
+
+def add_progress(run_id, count):
+    key = _progress_key(run_id, 'done')
+    try:
+        cache.incr(key, count)
+    except ValueError:
+        # The progress keys expired during the run; count again from here
+        cache.add(_progress_key(run_id, 'status'), 'running', timeout=PROGRESS_TTL)
+        if not cache.add(key, count, timeout=PROGRESS_TTL):
+            cache.incr(key, count)
+
+
+def finish_progress(run_id, output):
+    cache.set_many({
+        _progress_key(run_id, 'status'): 'complete',
+        _progress_key(run_id, 'output'): str(output),
+    }, timeout=PROGRESS_TTL)
+
+
+def get_progress(run_id):
+    """Return total and generated statement counts, status and output path of a run"""
+    fields = ['total', 'done', 'status', 'started', 'output']
+    values = cache.get_many([_progress_key(run_id, field) for field in fields])
+    return {field: values.get(_progress_key(run_id, field)) for field in fields}
@@ -1,13 +1,18 @@
-from celery import shared_task
+from celery import chord, shared_task
 from django.conf import settings
-import openpyxl
 from datetime import datetime
 from decimal import Decimal
+from django.utils import timezone
 from apps.customers.models import Customer
 from apps.loans.models import Loan
+from apps.loans.partitions import ensure_loan_partitions, ensure_year_partitions, sync_loan_id_sequence
+from apps.core.ingestion import run_ingestion
+from apps.core.utils import sync_id_sequence
+from apps.core.db_router import replica_reads
+from apps.core import statements
 
 
-@shared_task(bind=True, max_retries=3)
+@shared_task(bind=True, max_retries=3, acks_late=True, ignore_result=False)
 def ingest_customer_data(self):
     """
     Background task to ingest customer data from Excel file
@@ -15,40 +20,9 @@ def ingest_customer_data(self):
     file_path = settings.DATA_DIR / 'customer_data.xlsx'
 
     try:
-        workbook = openpyxl.load_workbook(file_path)
-        sheet = workbook.active
-
-        customers_created = 0
-        customers_updated = 0
-
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            if not row[0]:
-                continue
-
-            customer_id = row[0]
-            first_name = row[1]
-            last_name = row[2]
-            phone_number = row[3]
-            monthly_salary = Decimal(str(row[4]))
-            approved_limit = Decimal(str(row[5]))
-            current_debt = Decimal(str(row[6])) if row[6] else Decimal('0')
-
-            customer, created = Customer.objects.update_or_create(
-                customer_id=customer_id,
-                defaults={
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'phone_number': phone_number,
-                    'monthly_salary': monthly_salary,
-                    'approved_limit': approved_limit,
-                    'current_debt': current_debt
-                }
-            )
-
-            if created:
-                customers_created += 1
-            else:
-                customers_updated += 1
+        customers_created, customers_updated = run_ingestion(
+            self, 'ingest_customer_data', file_path, _ingest_customer_rows
+        )
 
         return {
             'status': 'success',
@@ -60,7 +34,46 @@ def ingest_customer_data(self):
         self.retry(exc=e, countdown=60)
 
 
-@shared_task(bind=True, max_retries=3)
+def _ingest_customer_rows(rows):
+    customers_created = 0
+    customers_updated = 0
+
+    for row in rows:
+        if not row[0]:
+            continue
+
+        customer_id = row[0]
+        first_name = row[1]
+        last_name = row[2]
+        phone_number = row[3]
+        monthly_salary = Decimal(str(row[4]))
+        approved_limit = Decimal(str(row[5]))
+        current_debt = Decimal(str(row[6])) if row[6] else Decimal('0')
+
+        customer, created = Customer.objects.update_or_create(
+            customer_id=customer_id,
+            defaults={
+                'first_name': first_name,
+                'last_name': last_name,
+                'phone_number': phone_number,
+                'monthly_salary': monthly_salary,
+                'approved_limit': approved_limit,
+                'current_debt': current_debt
+            }
+        )
+
+        if created:
+            customers_created += 1
+        else:
+            customers_updated += 1
+
+    # Rows carry their own customer_id, which does not advance the sequence
+    sync_id_sequence(Customer._meta.db_table, 'customer_id')
+
+    return customers_created, customers_updated
+
+
+@shared_task(bind=True, max_retries=3, acks_late=True, ignore_result=False)
 def ingest_loan_data(self):
     """
     Background task to ingest loan data from Excel file
@@ -68,56 +81,9 @@ def ingest_loan_data(self):
     file_path = settings.DATA_DIR / 'loan_data.xlsx'
 
     try:
-        workbook = openpyxl.load_workbook(file_path)
-        sheet = workbook.active
-
-        loans_created = 0
-        loans_updated = 0
-
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            if not row[0]:
-                continue
-
-            customer_id = row[0]
-            loan_id = row[1]
-            loan_amount = Decimal(str(row[2]))
-            tenure = int(row[3])
-            interest_rate = Decimal(str(row[4]))
-            monthly_repayment = Decimal(str(row[5]))
-            emis_paid_on_time = int(row[6])
-
-            start_date = row[7]
-            if isinstance(start_date, str):
-                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-
-            end_date = row[8]
-            if isinstance(end_date, str):
-                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-
-            try:
-                customer = Customer.objects.get(customer_id=customer_id)
-            except Customer.DoesNotExist:
-                continue
-
-            loan, created = Loan.objects.update_or_create(
-                loan_id=loan_id,
-                defaults={
-                    'customer': customer,
-                    'loan_amount': loan_amount,
-                    'tenure': tenure,
-                    'interest_rate': interest_rate,
-                    'monthly_repayment': monthly_repayment,
-                    'emis_paid_on_time': emis_paid_on_time,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'is_active': True
-                }
-            )
-
-            if created:
-                loans_created += 1
-            else:
-                loans_updated += 1
+        loans_created, loans_updated = run_ingestion(
+            self, 'ingest_loan_data', file_path, _ingest_loan_rows
+        )
 
         return {
             'status': 'success',
@@ -129,11 +95,155 @@ def ingest_loan_data(self):
         self.retry(exc=e, countdown=60)
 
 
-@shared_task
+def _ingest_loan_rows(rows):
+    loans_created = 0
+    loans_updated = 0
+
+    known_customer_ids = set(
+        Customer.objects.filter(
+            customer_id__in=[row[0] for row in rows if row[0]]
+        ).values_list('customer_id', flat=True)
+    )
+
+    # Give every start_date year its own partition before inserting, so
+    # historical loans do not pile up in the default partition
+    ensure_year_partitions({_parse_date(row[7]).year for row in rows if row[0]})
+
+    for row in rows:
+        if not row[0]:
+            continue
+
+        customer_id = row[0]
+        loan_id = row[1]
+        loan_amount = Decimal(str(row[2]))
+        tenure = int(row[3])
+        interest_rate = Decimal(str(row[4]))
+        monthly_repayment = Decimal(str(row[5]))
+        emis_paid_on_time = int(row[6])
+
+        start_date = _parse_date(row[7])
+        end_date = _parse_date(row[8])
+
+        if customer_id not in known_customer_ids:
+            continue
+
+        loan, created = Loan.objects.update_or_create(
+            loan_id=loan_id,
+            defaults={
+                'customer_id': customer_id,
+                'loan_amount': loan_amount,
+                'tenure': tenure,
+                'interest_rate': interest_rate,
+                'monthly_repayment': monthly_repayment,
+                'emis_paid_on_time': emis_paid_on_time,
+                'start_date': start_date,
+                'end_date': end_date,
+                'is_active': True
+            }
+        )
+
+        if created:
+            loans_created += 1
+        else:
+            loans_updated += 1
+
+    # Rows carry their own loan_id, which does not advance the sequence
+    sync_loan_id_sequence()
+
+    return loans_created, loans_updated
+
+
+def _parse_date(value):
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return value
+
+
+@shared_task(ignore_result=False)
 def ingest_all_data():
     """
     Master task to ingest both customer and loan data
     """
-    ingest_customer_data.delay()
-    ingest_loan_data.delay()
-    return {'status': 'Data ingestion tasks queued'}
+    customers_result = ingest_customer_data.delay()
+    loans_result = ingest_loan_data.delay()
+    return {
+        'status': 'Data ingestion tasks queued',
+        'tasks': {
+            'ingest_customer_data': customers_result.id,
+            'ingest_loan_data': loans_result.id
+        }
+    }
+
+
+@shared_task
+def create_loan_partitions():
+    """
+    Periodic task to create upcoming yearly loans partitions
+    """
+    return {'partitions': ensure_loan_partitions()}
+
+
+@shared_task
+def generate_statements(run_id=None, customer_ids=None, shards=None, archive=True):
+    """
+    Master task to generate a loan statement workbook per customer, split
+    into shards that run in parallel on the workers
+    """
+    run_id = run_id or statements.new_run_id()
+    shard_specs = statements.build_shards(customer_ids, shards or settings.STATEMENT_SHARDS)
+    if not shard_specs:
+        return {'status': 'No loans to report', 'run_id': run_id}
+
+    statements.run_dir(run_id).mkdir(parents=True, exist_ok=True)
+    with replica_reads():
+        total = statements.count_customers(shard_specs)
+    statements.start_progress(run_id, total)
+
+    chord(
+        generate_statement_shard.s(run_id, shard) for shard in shard_specs
+    )(finish_statements.s(run_id, archive))
+
+    return {'status': 'Statement tasks queued', 'run_id': run_id, 'shards': len(shard_specs)}
+
+
+@shared_task(bind=True, acks_late=True, ignore_result=False)
+def generate_statement_shard(self, run_id, shard):
+    """
+    Write the statements of one shard from a single streaming loans query
+    """
+    directory = statements.run_dir(run_id)
+    statement_date = timezone.now().date()
+    generated = 0
+    pending = 0
+
+    with replica_reads():
+        for customer, loans in statements.iter_customer_loans(statements.shard_loans(shard)):
+            path = directory / f'statement_{customer.customer_id}.xlsx'
+            statements.write_statement(path, customer, loans, statement_date)
+            generated += 1
+            pending += 1
+
+            if pending == settings.STATEMENT_PROGRESS_INTERVAL:
+                statements.add_progress(run_id, pending)
+                self.update_state(state='PROGRESS', meta={'run_id': run_id, 'generated': generated})
+                pending = 0
+
+    if pending:
+        statements.add_progress(run_id, pending)
+
+    return {'generated': generated}
+
+
+@shared_task
+def finish_statements(results, run_id, archive=True):
+    """
+    Chord callback: optionally zip the run's statements and mark it complete
+    """
+    output = statements.archive_statements(run_id) if archive else statements.run_dir(run_id)
+    statements.finish_progress(run_id, output)
+    return {
+        'status': 'success',
+        'run_id': run_id,
+        'statements': sum(result['generated'] for result in results),
+        'output': str(output)
+    }
@@ -0,0 +1,134 @@
+from datetime import date
+import numpy as np
+from prometheus_client import REGISTRY
+from django.test import TestCase
+from django.utils import timezone
+from apps.core.services.backtest import evaluate_policy, load_features
+from apps.core.services.eligibility import EligibilityService
+from apps.core.services.policy import DEFAULT_POLICY
+from apps.customers.models import Customer
+from apps.loans.models import Loan
+
+LOAN_AMOUNT = 200000
+INTEREST_RATE = 10.5
+TENURE = 24
+
+MODIFIED_POLICY = {
+    **DEFAULT_POLICY,
+    'no_history_score': 35,
+    'payment_history_weight': 0.3,
+    'loan_count_bands': [(1, 25), (4, 15)],
+    'current_year_max_active': 2,
+    'reject_score': 20,
+    'rate_floors': [(60, None), (40, 13.5), (20, 18.0)],
+    'max_emi_salary_ratio': 0.6,
+}
+
+
+def decisions_served():
+    return sum(
+        sample.value
+        for metric in REGISTRY.collect() if metric.name == 'eligibility_decisions'
+        for sample in metric.samples if sample.name == 'eligibility_decisions_total'
+    )
+
+
+def past(amount=50000, tenure=12, on_time=12, active=False, emi=1000):
+    year = timezone.now().year
+    return (amount, tenure, on_time, emi, date(year - 5, 3, 1), date(year - 4, 3, 1), active)
+
+
+def current(amount=50000, tenure=12, on_time=12, active=True, emi=1000):
+    year = timezone.now().year
+    return (amount, tenure, on_time, emi, date(year, 1, 15), date(year + 1, 1, 15), active)
+
+
+# (monthly_salary, approved_limit, loans) covering each branch of the
+# credit score and eligibility rules under DEFAULT_POLICY
+CUSTOMERS = {
+    'no history': (100000, 3600000, []),
+    'score above 50 keeps the requested rate': (
+        100000, 5000000, [current(amount=1200000, tenure=24, on_time=24)]
+    ),
+    'score 30-50 gets the 12% floor': (100000, 3600000, [past(on_time=3)] * 3),
+    'score of exactly 30 gets the 16% floor': (
+        100000, 3600000, [past(amount=40000, on_time=0)] * 3
+    ),
+    'score 10-30 gets the 16% floor': (
+        100000, 3600000, [current(amount=20000, on_time=0, active=False)] * 12
+    ),
+    'score of exactly 10 is rejected': (
+        100000, 3600000, [current(amount=1000, on_time=0, active=False)] * 11
+    ),
+    'over the approved limit': (
+        100000, 100000, [current(amount=150000, on_time=12)]
+    ),
+    'over the EMI limit': (10000, 3600000, [past(on_time=12, active=True, emi=3000)]),
+    'more than 3 active loans this year': (100000, 3600000, [current(on_time=11)] * 4),
+    'fractional payment history': (100000, 3600000, [past(tenure=3, on_time=1)]),
+    'over 10 loans with large volume': (
+        200000, 9000000, [past(amount=60000, on_time=10)] * 11 + [current(amount=300000)]
+    ),
+}
+
+
+class PolicyBacktestParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for phone_number, (salary, limit, loans) in enumerate(CUSTOMERS.values(), start=9000000000):
+            customer = Customer.objects.create(
+                first_name='Test', last_name=str(phone_number), phone_number=phone_number,
+                monthly_salary=salary, approved_limit=limit
+            )
+            Loan.objects.bulk_create(
+                Loan(
+                    customer=customer, loan_amount=amount, tenure=tenure, emis_paid_on_time=on_time,
+                    interest_rate=12, monthly_repayment=emi, start_date=start_date,
+                    end_date=end_date, is_active=active
+                )
+                for amount, tenure, on_time, emi, start_date, end_date, active in loans
+            )
+
+    def assert_matches_live_services(self, policy):
+        features = load_features()
+        results = evaluate_policy(features, policy, LOAN_AMOUNT, INTEREST_RATE, TENURE)
+        customers = Customer.objects.in_bulk()
+        self.assertEqual(len(features['customer_id']), len(CUSTOMERS))
+
+        outcomes = set()
+        for index, (case, customer_id) in enumerate(zip(CUSTOMERS, features['customer_id'])):
+            live = EligibilityService(customers[int(customer_id)], policy).check_eligibility(
+                LOAN_AMOUNT, INTEREST_RATE, TENURE
+            )
+            with self.subTest(case=case):
+                self.assertEqual(int(results['credit_score'][index]), live['credit_score'])
+                self.assertEqual(bool(results['approval'][index]), live['approval'])
+                self.assertEqual(
+                    float(results['corrected_interest_rate'][index]),
+                    float(live['corrected_interest_rate'])
+                )
+                self.assertTrue(np.isclose(
+                    results['monthly_installment'][index], live['monthly_installment']
+                ))
+                self.assertEqual(results['rejection_reason'][index], live['rejection_reason'] or '')
+            outcomes.add((live['rejection_reason'], float(live['corrected_interest_rate'])))
+        return outcomes
+
+    def test_default_policy_matches_live_services(self):
+        decisions = decisions_served()
+        outcomes = self.assert_matches_live_services(DEFAULT_POLICY)
+        # Offline checks are not served decisions
+        self.assertEqual(decisions_served(), decisions)
+
+        # Every rate band and rejection reason is exercised
+        self.assertLessEqual(
+            {(None, INTEREST_RATE), (None, 12.0), (None, 16.0)}, outcomes
+        )
+        self.assertLessEqual({'credit_score', 'emi_limit'}, {reason for reason, _ in outcomes})
+
+    def test_modified_policy_matches_live_services(self):
+        outcomes = self.assert_matches_live_services(MODIFIED_POLICY)
+
+        self.assertLessEqual(
+            {(None, INTEREST_RATE), (None, 13.5), (None, 18.0)}, outcomes
+        )
@@ -0,0 +1,122 @@
+import threading
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+from apps.core.services.coalescing import SingleFlight
+from apps.core.services.credit_score import CreditScoreCalculator
+from apps.core.services.eligibility import eligibility_flight
+from apps.customers.models import Customer
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+CHECK = {'customer_id': None, 'loan_amount': 100000, 'interest_rate': 10, 'tenure': 12}
+
+
+def approvals():
+    return REGISTRY.get_sample_value(
+        'eligibility_decisions_total', {'approved': 'true', 'reason': 'none'}
+    ) or 0
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('Timed out waiting for condition')
+        time.sleep(0.005)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, DECISION_LOG_ENABLED=False)
+class CheckEligibilityCoalescingTests(TransactionTestCase):
+    # check-eligibility reads from a replica when DB_REPLICAS is set
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        customer = Customer.objects.create(
+            first_name='John', last_name='Doe', age=30,
+            phone_number=9876543210, monthly_salary=50000
+        )
+        self.check = {**CHECK, 'customer_id': customer.customer_id}
+
+    def post_check(self):
+        try:
+            return APIClient().post('/check-eligibility', self.check, format='json')
+        finally:
+            connection.close()
+
+    def test_parallel_identical_checks_compute_once(self):
+        requests = 8
+        coalesced_before = eligibility_flight.stats()['coalesced']
+        approvals_before = approvals()
+
+        def calculate(calculator):
+            # Stay in flight until every other request is waiting on this one
+            wait_for(lambda: eligibility_flight.stats()['coalesced'] - coalesced_before == requests - 1)
+            return 42
+
+        responses = []
+        with mock.patch.object(CreditScoreCalculator, 'calculate', autospec=True, side_effect=calculate) as patched:
+            threads = [
+                threading.Thread(target=lambda: responses.append(self.post_check()))
+                for _ in range(requests)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(patched.call_count, 1)
+        self.assertEqual([response.status_code for response in responses], [200] * requests)
+        self.assertEqual(len({response.content for response in responses}), 1)
+        # Every served decision is counted, including the coalesced ones
+        self.assertEqual(approvals() - approvals_before, requests)
+
+    def test_sequential_checks_are_not_shared(self):
+        with mock.patch.object(CreditScoreCalculator, 'calculate', return_value=42) as patched:
+            self.post_check()
+            self.post_check()
+
+        self.assertEqual(patched.call_count, 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SingleFlightAcrossWorkersTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        # Two flights sharing a cache stand in for two worker processes
+        self.worker_a = SingleFlight('test', use_cache=True, poll_interval=0.005)
+        self.worker_b = SingleFlight('test', use_cache=True, poll_interval=0.005)
+
+    def share_flight(self, result):
+        """Run a call returning result in worker A and an overlapping one in worker B"""
+        release = threading.Event()
+        results = {}
+
+        def leader():
+            release.wait(5)
+            return result
+
+        a = threading.Thread(target=lambda: results.setdefault('a', self.worker_a.do('key', leader)))
+        a.start()
+        wait_for(lambda: cache.get('singleflight:test:key:lock') is not None)
+        b = threading.Thread(target=lambda: results.setdefault('b', self.worker_b.do('key', lambda: 'computed by b')))
+        b.start()
+        time.sleep(0.05)
+        release.set()
+        a.join()
+        b.join()
+        return results
+
+    def test_waiter_in_other_worker_shares_result(self):
+        self.assertEqual(self.share_flight('first'), {'a': 'first', 'b': 'first'})
+        self.assertEqual(self.worker_b.stats()['executed'], 0)
+
+    def test_waiter_does_not_get_result_of_earlier_call(self):
+        self.share_flight('first')
+        # The first result is still cached, but belongs to a call that is over
+        self.assertEqual(self.share_flight('second'), {'a': 'second', 'b': 'second'})
+        self.assertEqual(self.worker_b.do('key', lambda: 'third'), 'third')
@@ -0,0 +1,112 @@
+import time
+import unittest
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.core.db_router import replica_reads, set_replica_reads
+from apps.customers.models import Customer
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+REGISTRATION = {
+    'first_name': 'John', 'last_name': 'Doe', 'age': 30,
+    'monthly_income': 50000, 'phone_number': 9876543210
+}
+
+# Replica aliases only exist when DB_REPLICAS is set
+HAS_REPLICA = 'replica_1' in settings.DATABASES
+requires_replica = unittest.skipUnless(HAS_REPLICA, 'set DB_REPLICAS to test replica routing')
+
+
+@requires_replica
+@override_settings(CACHES=LOCMEM_CACHES, DATABASE_REPLICA_LAG_TOLERANCE=1)
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {'default', 'replica_1'} if HAS_REPLICA else {'default'}
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        set_replica_reads(False)
+
+    def queried_aliases(self, method, path, data=None, client_id='client-1'):
+        """Send a request and return the aliases of the databases it queried"""
+        client = APIClient(HTTP_X_CLIENT_ID=client_id)
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica_1']) as replica:
+            getattr(client, method)(path, data, format='json')
+        return {alias for alias, queries in (('default', primary), ('replica_1', replica)) if queries}
+
+    def test_read_only_endpoints_read_from_replica(self):
+        self.assertEqual(self.queried_aliases('get', '/view-loan/1'), {'replica_1'})
+        self.assertEqual(self.queried_aliases('get', '/view-loans/1'), {'replica_1'})
+
+    def test_writes_go_to_primary(self):
+        self.assertEqual(self.queried_aliases('post', '/register', REGISTRATION), {'default'})
+        self.assertTrue(Customer.objects.using('default').filter(phone_number=9876543210).exists())
+
+    def test_client_reads_from_primary_after_writing(self):
+        self.queried_aliases('post', '/register', REGISTRATION)
+
+        self.assertEqual(self.queried_aliases('get', '/view-loan/1'), {'default'})
+        # Other clients are not pinned
+        self.assertEqual(self.queried_aliases('get', '/view-loan/1', client_id='client-2'), {'replica_1'})
+
+        time.sleep(settings.DATABASE_REPLICA_LAG_TOLERANCE + 0.1)
+        self.assertEqual(self.queried_aliases('get', '/view-loan/1'), {'replica_1'})
+
+    def test_failed_write_does_not_pin_client(self):
+        self.queried_aliases('post', '/register', {**REGISTRATION, 'age': 'thirty'})
+
+        self.assertEqual(self.queried_aliases('get', '/view-loan/1'), {'replica_1'})
+
+    def test_routing_is_reset_after_each_request(self):
+        self.queried_aliases('get', '/view-loan/1')
+
+        self.assertEqual(router.db_for_read(Customer), 'default')
+
+
+@requires_replica
+class ReplicaReadsScopeTests(TestCase):
+    databases = {'default', 'replica_1'} if HAS_REPLICA else {'default'}
+
+    def tearDown(self):
+        set_replica_reads(False)
+
+    def test_replica_reads_scopes_reads(self):
+        self.assertEqual(router.db_for_read(Customer), 'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Customer), 'replica_1')
+        self.assertEqual(router.db_for_read(Customer), 'default')
+
+    def test_reads_stay_on_primary_after_write_in_scope(self):
+        with replica_reads():
+            self.assertEqual(router.db_for_write(Customer), 'default')
+            self.assertEqual(router.db_for_read(Customer), 'default')
+        # The next scope starts without the write
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Customer), 'replica_1')
+
+    def test_nested_scope_restores_outer_state(self):
+        set_replica_reads(True)
+        router.db_for_write(Customer)
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Customer), 'replica_1')
+        self.assertEqual(router.db_for_read(Customer), 'default')
+
+        set_replica_reads(False)
+        with replica_reads():
+            pass
+        self.assertEqual(router.db_for_read(Customer), 'default')
+
+    def test_set_replica_reads_resets_write(self):
+        set_replica_reads(True)
+        router.db_for_write(Customer)
+        self.assertEqual(router.db_for_read(Customer), 'default')
+
+        set_replica_reads(True)
+        self.assertEqual(router.db_for_read(Customer), 'replica_1')
+        set_replica_reads(False)
+        self.assertEqual(router.db_for_read(Customer), 'default')
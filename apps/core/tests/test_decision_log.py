@@ -0,0 +1,110 @@
+from decimal import Decimal
+from unittest import mock
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from prometheus_client import REGISTRY
+from apps.core.decision_log import DecisionLog
+from apps.core.models import EligibilityDecision
+
+REQUEST = {'loan_amount': 100000, 'interest_rate': 10, 'tenure': 12}
+RESULT = {
+    'approval': True,
+    'corrected_interest_rate': 12,
+    'monthly_installment': 8884.88,
+    'message': 'Loan approved',
+    'rejection_reason': None,
+    'credit_score': 42
+}
+
+
+def failed_count(reason):
+    return REGISTRY.get_sample_value('decision_log_failed_total', {'reason': reason}) or 0
+
+
+@override_settings(DECISION_LOG_ENABLED=True)
+@mock.patch.object(DecisionLog, '_ensure_started')
+class DecisionLogTests(TestCase):
+    def make_log(self, **kwargs):
+        options = {'max_buffer': 100, 'batch_size': 10, 'flush_interval': 60, 'max_retries': 2}
+        options.update(kwargs)
+        return DecisionLog(**options)
+
+    def test_flush_writes_buffered_decisions(self, _):
+        log = self.make_log(batch_size=2)
+        for customer_id in range(1, 6):
+            log.record('check-eligibility', customer_id, REQUEST, RESULT)
+        log.record('create-loan', 1, REQUEST, RESULT, loan_id=7)
+
+        self.assertEqual(log.flush(), 6)
+        decision = EligibilityDecision.objects.get(endpoint='create-loan')
+        self.assertEqual(decision.loan_id, 7)
+        self.assertEqual(decision.corrected_interest_rate, Decimal('12.00'))
+        self.assertEqual(decision.rejection_reason, '')
+
+    def test_drops_decisions_when_buffer_is_full(self, _):
+        log = self.make_log(max_buffer=2)
+        dropped = REGISTRY.get_sample_value('decision_log_dropped_total')
+        for customer_id in range(1, 5):
+            log.record('check-eligibility', customer_id, REQUEST, RESULT)
+
+        self.assertEqual(REGISTRY.get_sample_value('decision_log_dropped_total') - dropped, 2)
+        self.assertEqual(log.flush(), 2)
+
+    def test_rejects_values_the_table_cannot_hold(self, _):
+        log = self.make_log()
+        invalid = failed_count('invalid')
+        with self.assertLogs('apps.core.decision_log', 'WARNING'):
+            log.record('check-eligibility', 1, {**REQUEST, 'loan_amount': 1e11}, RESULT)
+        log.record('check-eligibility', 2, REQUEST, RESULT)
+
+        self.assertEqual(failed_count('invalid') - invalid, 1)
+        self.assertEqual(log.flush(), 1)
+        self.assertEqual(EligibilityDecision.objects.get().customer_id, 2)
+
+    def test_rejected_row_does_not_block_its_batch(self, _):
+        log = self.make_log()
+        errors = failed_count('error')
+        log.record('check-eligibility', 1, REQUEST, RESULT)
+        # Bypass the checks in record() to get a row the database rejects
+        log._queue.put_nowait(EligibilityDecision(
+            customer_id=2, endpoint='check-eligibility', loan_amount=Decimal('1e11'),
+            interest_rate=10, tenure=12, credit_score=42, approval=True,
+            corrected_interest_rate=10, monthly_installment=0, decided_at=timezone.now()
+        ))
+        log.record('check-eligibility', 3, REQUEST, RESULT)
+
+        with self.assertLogs('apps.core.decision_log', 'ERROR'):
+            self.assertEqual(log.flush(), 2)
+        self.assertEqual(failed_count('error') - errors, 1)
+        self.assertEqual(
+            sorted(EligibilityDecision.objects.values_list('customer_id', flat=True)), [1, 3]
+        )
+
+        log.record('check-eligibility', 4, REQUEST, RESULT)
+        self.assertEqual(log.flush(), 1)
+
+    def test_retries_while_database_is_unavailable(self, _):
+        log = self.make_log(batch_size=2, max_retries=2)
+        retries = failed_count('retries')
+        for customer_id in range(1, 4):
+            log.record('check-eligibility', customer_id, REQUEST, RESULT)
+
+        unavailable = mock.patch.object(
+            EligibilityDecision.objects, 'bulk_create', side_effect=OperationalError
+        )
+        with unavailable, self.assertLogs('apps.core.decision_log', 'ERROR'):
+            self.assertEqual(log.flush(), 0)
+            self.assertEqual(log.flush(), 0)
+        # The outage is over before the retries run out
+        self.assertEqual(log.flush(), 3)
+
+        for customer_id in range(4, 7):
+            log.record('check-eligibility', customer_id, REQUEST, RESULT)
+        with unavailable, self.assertLogs('apps.core.decision_log', 'ERROR'):
+            for _ in range(3):
+                self.assertEqual(log.flush(), 0)
+        self.assertEqual(failed_count('retries') - retries, 2)
+        # The discarded batch no longer holds up the rest of the buffer
+        self.assertEqual(log.flush(), 1)
+        self.assertEqual(EligibilityDecision.objects.count(), 4)
@@ -0,0 +1,142 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from apps.core import idempotency
+from apps.core.idempotency import idempotent
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+SCOPE = 'idempotency:create-thing:id:client-1:key-1'
+
+
+class CreateThingView(APIView):
+    calls = 0
+    during_call = None
+
+    @idempotent
+    def post(self, request):
+        CreateThingView.calls += 1
+        if CreateThingView.during_call:
+            CreateThingView.during_call()
+        return Response({'thing_id': CreateThingView.calls}, status=status.HTTP_201_CREATED)
+
+
+urlpatterns = [
+    path('things', CreateThingView.as_view(), name='create-thing'),
+]
+
+
+class RacingCache:
+    """
+    Wrap the cache and run on_miss the first time `miss_on` reads of the
+    response key have returned nothing, to simulate the original request
+    finishing between two steps of the decorator
+    """
+
+    def __init__(self, miss_on, on_miss):
+        self.miss_on = miss_on
+        self.on_miss = on_miss
+        self.response_reads = 0
+
+    def get(self, key, default=None):
+        if key == f'{SCOPE}:response':
+            self.response_reads += 1
+            if self.response_reads <= self.miss_on:
+                if self.response_reads == self.miss_on:
+                    self.on_miss()
+                return default
+        return cache.get(key, default)
+
+    def __getattr__(self, name):
+        return getattr(cache, name)
+
+
+def finish_original():
+    cache.set(
+        f'{SCOPE}:response',
+        {
+            'fingerprint': idempotency._fingerprint(mock.Mock(data={'name': 'a'})),
+            'status': status.HTTP_201_CREATED,
+            'data': {'thing_id': 1}
+        }
+    )
+    cache.delete(f'{SCOPE}:lock')
+
+
+@override_settings(
+    ROOT_URLCONF='apps.core.tests.test_idempotency',
+    CACHES=LOCMEM_CACHES,
+    IDEMPOTENCY_LOCK_TIMEOUT=1,
+    IDEMPOTENCY_POLL_INTERVAL=0.01
+)
+class IdempotentTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        CreateThingView.calls = 0
+        CreateThingView.during_call = None
+        self.client = APIClient(HTTP_X_CLIENT_ID='client-1')
+
+    def post(self, data=None, key='key-1'):
+        return self.client.post('/things', data or {'name': 'a'}, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_replays_stored_response(self):
+        first = self.post()
+        second = self.post()
+
+        self.assertEqual(CreateThingView.calls, 1)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+
+    def test_rejects_reused_key_with_different_body(self):
+        self.post()
+        response = self.post({'name': 'b'})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(CreateThingView.calls, 1)
+
+    def test_releases_lock_when_done(self):
+        self.post()
+
+        self.assertIsNone(cache.get(f'{SCOPE}:lock'))
+
+    def test_does_not_release_lock_taken_by_another_request(self):
+        def lock_expires_and_is_taken():
+            cache.set(f'{SCOPE}:lock', 'other')
+
+        CreateThingView.during_call = lock_expires_and_is_taken
+        self.post()
+
+        self.assertEqual(cache.get(f'{SCOPE}:lock'), 'other')
+
+    def test_replays_response_stored_before_lock_is_acquired(self):
+        # The original finishes after the first lookup misses, so the retry
+        # acquires the lock and must find the stored response
+        with mock.patch.object(idempotency, 'cache', RacingCache(miss_on=1, on_miss=finish_original)):
+            response = self.post()
+
+        self.assertEqual(CreateThingView.calls, 0)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'thing_id': 1})
+
+    def test_waiter_replays_response_stored_as_lock_is_released(self):
+        # The original holds the lock, then stores its response and releases
+        # the lock just after the waiter polled for the response
+        cache.set(f'{SCOPE}:lock', 'original')
+        with mock.patch.object(idempotency, 'cache', RacingCache(miss_on=2, on_miss=finish_original)):
+            response = self.post()
+
+        self.assertEqual(CreateThingView.calls, 0)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'thing_id': 1})
+
+    def test_waiter_gets_conflict_when_original_fails(self):
+        cache.set(f'{SCOPE}:lock', 'original', timeout=0.05)
+        response = self.post()
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(CreateThingView.calls, 0)
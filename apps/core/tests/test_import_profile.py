@@ -0,0 +1,53 @@
+from io import StringIO
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+from apps.core.management.commands.import_profile import measure_startup, parse_importtime
+
+API_SETTINGS = 'config.settings_api'
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:       200 |        200 |     django.utils.version
+import time:       500 |        700 |   django.utils
+import time:      1000 |       1700 | django
+"""
+
+# Packages the API profile must not load on startup: ingestion and
+# backtesting import them on first use, and the Celery beat/results apps
+# are left out of config.settings_api
+DEFERRED_PACKAGES = ('openpyxl', 'numpy', 'django_celery_beat', 'django_celery_results')
+
+
+class ParseImporttimeTests(SimpleTestCase):
+    def test_sums_top_level_cumulative_and_self_time_per_package(self):
+        total_us, by_package = parse_importtime(IMPORTTIME_OUTPUT)
+
+        self.assertEqual(total_us, 2120)
+        self.assertEqual(by_package, {'_io': 120, 'io': 300, 'django': 1700})
+
+
+class StartupBudgetTests(SimpleTestCase):
+    def test_api_profile_defers_heavy_packages(self):
+        _, by_package = measure_startup(API_SETTINGS)
+
+        self.assertTrue({'django', 'config', 'apps'} <= set(by_package))
+        for package in DEFERRED_PACKAGES:
+            self.assertNotIn(package, by_package)
+
+    def test_api_profile_starts_within_budget(self):
+        out = StringIO()
+        call_command(
+            'import_profile',
+            settings_module=API_SETTINGS,
+            budget_ms=settings.STARTUP_IMPORT_BUDGET_MS,
+            stdout=out
+        )
+
+        self.assertIn('Within the', out.getvalue())
+
+    def test_budget_overrun_fails(self):
+        with self.assertRaisesMessage(CommandError, 'exceeds the budget'):
+            call_command('import_profile', settings_module=API_SETTINGS, budget_ms=1, stdout=StringIO())
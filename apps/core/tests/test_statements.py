@@ -0,0 +1,60 @@
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+from apps.core import statements
+from apps.core.tasks import generate_statements
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class BuildShardsTests(SimpleTestCase):
+    def test_splits_customer_ids_into_shards(self):
+        self.assertEqual(
+            statements.build_shards([5, 1, 3, 3, 2], shard_count=2),
+            [{'customer_ids': [1, 2]}, {'customer_ids': [3, 5]}]
+        )
+
+    def test_rejects_fewer_than_one_shard(self):
+        for shard_count in (0, -1):
+            with self.subTest(shard_count=shard_count), self.assertRaises(ValueError):
+                statements.build_shards([1, 2], shard_count=shard_count)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StatementProgressTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def progress(self, run_id):
+        out = StringIO()
+        call_command('generate_statements', progress=run_id, stdout=out)
+        return out.getvalue().strip()
+
+    def test_reports_progress(self):
+        statements.start_progress('run-1', 10)
+        statements.add_progress('run-1', 4)
+
+        self.assertEqual(self.progress('run-1'), 'running: 4/10 statements')
+
+    def test_keeps_counting_after_progress_expires(self):
+        statements.start_progress('run-1', 10)
+        cache.clear()
+
+        statements.add_progress('run-1', 4)
+        statements.add_progress('run-1', 3)
+
+        self.assertEqual(self.progress('run-1'), 'running: 7/? statements')
+
+    def test_unknown_run_is_an_error(self):
+        with self.assertRaisesMessage(CommandError, 'Unknown or expired statement run: missing'):
+            self.progress('missing')
+
+
+class GenerateStatementsCommandTests(SimpleTestCase):
+    @mock.patch.object(generate_statements, 'delay')
+    def test_rejects_fewer_than_one_shard(self, delay):
+        with self.assertRaisesMessage(CommandError, '--shards must be at least 1'):
+            call_command('generate_statements', shards=0)
+        delay.assert_not_called()
@@ -1,4 +1,5 @@
 from decimal import Decimal
+from django.db import connections
 
 
 def round_to_nearest_lakh(amount):
@@ -15,3 +16,27 @@ def calculate_approved_limit(monthly_salary):
     """
     raw_limit = 36 * float(monthly_salary)
     return Decimal(str(round_to_nearest_lakh(raw_limit)))
+
+
+def sync_id_sequence(table, column, using='default'):
+    """
+    Move the sequence behind table.column past the highest stored id. Needed
+    after rows are inserted with explicit ids, as ingestion does, so new
+    rows do not draw ids that are already taken. The sequence never moves
+    backwards. PostgreSQL only.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT setval(seq, max_id) FROM (
+                SELECT pg_get_serial_sequence(%s, %s)::regclass AS seq, MAX({column}) AS max_id
+                FROM {table}
+            ) current
+            WHERE max_id > COALESCE(pg_sequence_last_value(seq), 0)
+            """,
+            [table, column]
+        )
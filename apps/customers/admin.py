@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models import Q
+from apps.core.paginators import EstimatedCountPaginator
 from .models import Customer
 
 
@@ -6,6 +8,20 @@ from .models import Customer
 class CustomerAdmin(admin.ModelAdmin):
     list_display = ['customer_id', 'first_name', 'last_name', 'phone_number',
                     'monthly_salary', 'approved_limit', 'current_debt']
-    search_fields = ['first_name', 'last_name', 'phone_number']
+    search_fields = ['first_name', 'last_name']
+    search_help_text = 'Customer ID or phone number (exact), or part of a name'
     list_filter = ['created_at']
     readonly_fields = ['created_at', 'updated_at']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Numeric terms match the customer_id and phone_number indexes exactly;
+        name searches use the trigram indexes on first_name and last_name
+        """
+        search_term = search_term.strip()
+        if search_term.isdigit():
+            value = int(search_term)
+            return queryset.filter(Q(customer_id=value) | Q(phone_number=value)), False
+        return super().get_search_results(request, queryset, search_term)
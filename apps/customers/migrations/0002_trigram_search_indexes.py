@@ -0,0 +1,41 @@
+from django.db import migrations
+
+TRIGRAM_INDEXES = {
+    'customers_first_name_trgm': 'first_name',
+    'customers_last_name_trgm': 'last_name',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Index UPPER(column) with gin_trgm_ops so the admin's icontains searches
+    (UPPER(column::text) LIKE UPPER('%term%')) can use an index. PostgreSQL only.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} '
+            f'ON customers USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for index_name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.validators import MinValueValidator
+from apps.core.utils import calculate_approved_limit
 
 
 class Customer(models.Model):
@@ -32,6 +33,7 @@ class Customer(models.Model):
         indexes = [
             models.Index(fields=['phone_number']),
             models.Index(fields=['customer_id']),
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
@@ -39,6 +41,5 @@ class Customer(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.approved_limit:
-            raw_limit = 36 * float(self.monthly_salary)
-            self.approved_limit = round(raw_limit / 100000) * 100000
+            self.approved_limit = calculate_approved_limit(self.monthly_salary)
         super().save(*args, **kwargs)
@@ -1,6 +1,28 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from apps.core.utils import calculate_approved_limit
 from .models import Customer
 
+PHONE_NUMBER_EXISTS = "Phone number already exists"
+
+
+def phone_number_conflicts(error, phone_numbers):
+    """
+    Phone numbers among phone_numbers that are already registered, when the
+    IntegrityError came from the phone_number unique constraint. Empty for
+    any other constraint, e.g. a customer_id collision.
+    """
+    constraint = getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None)
+    if constraint and 'phone_number' not in constraint:
+        return set()
+
+    return set(
+        Customer.objects.filter(
+            phone_number__in=phone_numbers
+        ).values_list('phone_number', flat=True)
+    )
+
 
 class CustomerRegistrationSerializer(serializers.Serializer):
     first_name = serializers.CharField(max_length=100)
@@ -10,21 +32,118 @@ class CustomerRegistrationSerializer(serializers.Serializer):
     phone_number = serializers.IntegerField()
 
     def validate_phone_number(self, value):
-        if Customer.objects.filter(phone_number=value).exists():
-            raise serializers.ValidationError("Phone number already exists")
         if value < 1000000000 or value > 9999999999:
             raise serializers.ValidationError("Invalid phone number")
         return value
 
     def create(self, validated_data):
+        """
+        Insert the customer in a single round trip, relying on the unique
+        constraint on phone_number instead of a separate existence check
+        """
         monthly_income = validated_data.pop('monthly_income')
-        customer = Customer.objects.create(
-            monthly_salary=monthly_income,
-            **validated_data
-        )
+        try:
+            with transaction.atomic():
+                customer = Customer.objects.create(
+                    monthly_salary=monthly_income,
+                    **validated_data
+                )
+        except IntegrityError as e:
+            if not phone_number_conflicts(e, [validated_data['phone_number']]):
+                raise
+            raise serializers.ValidationError({'phone_number': [PHONE_NUMBER_EXISTS]})
         return customer
 
 
+class CustomerBulkRegistrationSerializer(serializers.Serializer):
+    customers = serializers.ListField(
+        # Rows are validated one by one in create() so a malformed row is
+        # reported by index instead of failing the whole request
+        child=serializers.JSONField(),
+        allow_empty=False,
+        max_length=settings.CUSTOMER_BULK_REGISTER_MAX_ROWS
+    )
+
+    def create(self, validated_data):
+        """
+        Validate every row, then insert the valid ones with bulk_create
+        Returns: (created customers, list of per-row errors keyed by index)
+        """
+        rows = {}
+        errors = []
+        seen_phone_numbers = set()
+
+        for index, item in enumerate(validated_data['customers']):
+            row_serializer = CustomerRegistrationSerializer(data=item)
+            if not row_serializer.is_valid():
+                errors.append({'index': index, 'errors': row_serializer.errors})
+                continue
+
+            phone_number = row_serializer.validated_data['phone_number']
+            if phone_number in seen_phone_numbers:
+                errors.append({
+                    'index': index,
+                    'errors': {'phone_number': ["Duplicate phone number in request"]}
+                })
+                continue
+
+            seen_phone_numbers.add(phone_number)
+            rows[index] = row_serializer.validated_data
+
+        created = self._bulk_insert(rows, errors)
+        errors.sort(key=lambda error: error['index'])
+        return created, errors
+
+    def _bulk_insert(self, rows, errors):
+        """
+        Drop rows whose phone number is already taken and bulk insert the rest.
+        A concurrent registration can still take a phone number between the
+        lookup and the insert; those rows are then rejected too and the rest
+        inserted again. Each retry drops at least one row, so this ends.
+        """
+        while True:
+            self._reject_existing_phone_numbers(rows, errors)
+            if not rows:
+                return []
+
+            customers = [
+                Customer(
+                    first_name=data['first_name'],
+                    last_name=data['last_name'],
+                    age=data['age'],
+                    phone_number=data['phone_number'],
+                    monthly_salary=data['monthly_income'],
+                    approved_limit=calculate_approved_limit(data['monthly_income'])
+                )
+                for data in rows.values()
+            ]
+
+            try:
+                with transaction.atomic():
+                    return Customer.objects.bulk_create(
+                        customers,
+                        batch_size=settings.CUSTOMER_BULK_REGISTER_BATCH_SIZE
+                    )
+            except IntegrityError as e:
+                phone_numbers = [data['phone_number'] for data in rows.values()]
+                if not phone_number_conflicts(e, phone_numbers):
+                    raise
+
+    def _reject_existing_phone_numbers(self, rows, errors):
+        phone_numbers = [data['phone_number'] for data in rows.values()]
+        existing = set(
+            Customer.objects.filter(
+                phone_number__in=phone_numbers
+            ).values_list('phone_number', flat=True)
+        )
+        if not existing:
+            return
+
+        for index in [i for i, data in rows.items() if data['phone_number'] in existing]:
+            del rows[index]
+            errors.append({'index': index, 'errors': {'phone_number': [PHONE_NUMBER_EXISTS]}})
+
+
 class CustomerResponseSerializer(serializers.ModelSerializer):
     name = serializers.SerializerMethodField()
     monthly_income = serializers.DecimalField(
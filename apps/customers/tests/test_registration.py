@@ -0,0 +1,118 @@
+import unittest
+from unittest import mock
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from apps.core.tasks import _ingest_customer_rows
+from apps.customers.models import Customer
+from apps.customers.serializers import PHONE_NUMBER_EXISTS, CustomerBulkRegistrationSerializer
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def customer_data(phone_number, **overrides):
+    return {
+        'first_name': 'John', 'last_name': 'Doe', 'age': 30,
+        'monthly_income': 50000, 'phone_number': phone_number, **overrides
+    }
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CustomerRegistrationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def register(self, data):
+        return self.client.post('/register', data, format='json')
+
+    def test_registers_customer(self):
+        response = self.register(customer_data(9876543210))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['approved_limit'], '1800000.00')
+
+    def test_rejects_registered_phone_number(self):
+        self.register(customer_data(9876543210))
+        response = self.register(customer_data(9876543210, first_name='Jane'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'phone_number': [PHONE_NUMBER_EXISTS]})
+
+    def test_other_integrity_errors_are_not_reported_as_phone_conflicts(self):
+        error = IntegrityError('duplicate key value violates unique constraint "customers_pkey"')
+        with mock.patch.object(Customer.objects, 'create', side_effect=error):
+            with self.assertRaises(IntegrityError):
+                self.register(customer_data(9876543210))
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'sequences are PostgreSQL only')
+    def test_registers_after_ingesting_explicit_customer_ids(self):
+        rows = [
+            (customer_id, 'Ingested', 'Customer', 9000000000 + customer_id, 50000, 1800000, 0)
+            for customer_id in range(1, 4)
+        ]
+        _ingest_customer_rows(rows)
+
+        response = self.register(customer_data(9876543210))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertGreater(response.data['customer_id'], 3)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CustomerBulkRegistrationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def register(self, rows):
+        return self.client.post('/register/bulk', {'customers': rows}, format='json')
+
+    def test_reports_errors_per_row(self):
+        Customer.objects.create(
+            first_name='Existing', last_name='Customer', phone_number=9000000001, monthly_salary=50000
+        )
+        response = self.register([
+            customer_data(9000000000),
+            'not an object',
+            customer_data(9000000001),
+            customer_data(9000000002, age=10),
+            customer_data(9000000000),
+            customer_data(9000000003),
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [customer['phone_number'] for customer in response.data['created']],
+            [9000000000, 9000000003]
+        )
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 3, 4])
+        self.assertIn('non_field_errors', response.data['errors'][0]['errors'])
+        self.assertEqual(response.data['errors'][1]['errors'], {'phone_number': [PHONE_NUMBER_EXISTS]})
+
+    def test_phone_numbers_taken_after_lookup_are_reported_per_row(self):
+        serializer_class = CustomerBulkRegistrationSerializer
+        lookup = serializer_class._reject_existing_phone_numbers
+        concurrent_phone_numbers = [9000000001, 9000000002]
+        lookups = []
+
+        def racing_lookup(serializer, rows, errors):
+            # Other requests register one of the phone numbers right after each lookup
+            lookups.append(1)
+            lookup(serializer, rows, errors)
+            if concurrent_phone_numbers:
+                Customer.objects.create(
+                    first_name='Concurrent', last_name='Customer',
+                    phone_number=concurrent_phone_numbers.pop(0), monthly_salary=50000
+                )
+
+        with mock.patch.object(serializer_class, '_reject_existing_phone_numbers', racing_lookup):
+            response = self.register([
+                customer_data(9000000000), customer_data(9000000001), customer_data(9000000002)
+            ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([customer['phone_number'] for customer in response.data['created']], [9000000000])
+        self.assertEqual(response.data['errors'], [
+            {'index': 1, 'errors': {'phone_number': [PHONE_NUMBER_EXISTS]}},
+            {'index': 2, 'errors': {'phone_number': [PHONE_NUMBER_EXISTS]}},
+        ])
+        self.assertEqual(len(lookups), 3)
@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import CustomerRegistrationView
+from .views import CustomerRegistrationView, CustomerBulkRegistrationView
 
 urlpatterns = [
     path('register', CustomerRegistrationView.as_view(), name='register-customer'),
+    path('register/bulk', CustomerBulkRegistrationView.as_view(), name='register-customers-bulk'),
 ]
@@ -1,10 +1,16 @@
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from .serializers import CustomerRegistrationSerializer, CustomerResponseSerializer
+from apps.core.idempotency import idempotent
+from .serializers import (
+    CustomerRegistrationSerializer,
+    CustomerBulkRegistrationSerializer,
+    CustomerResponseSerializer
+)
 
 
 class CustomerRegistrationView(APIView):
+    @idempotent
     def post(self, request):
         serializer = CustomerRegistrationSerializer(data=request.data)
         if serializer.is_valid():
@@ -12,3 +18,19 @@ class CustomerRegistrationView(APIView):
             response_serializer = CustomerResponseSerializer(customer)
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class CustomerBulkRegistrationView(APIView):
+    @idempotent
+    def post(self, request):
+        serializer = CustomerBulkRegistrationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        customers, errors = serializer.save()
+        response_data = {
+            'created': CustomerResponseSerializer(customers, many=True).data,
+            'errors': errors
+        }
+        response_status = status.HTTP_201_CREATED if customers else status.HTTP_400_BAD_REQUEST
+        return Response(response_data, status=response_status)
@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models import Q
+from apps.core.paginators import EstimatedCountPaginator
 from .models import Loan
 
 
@@ -6,6 +8,22 @@ from .models import Loan
 class LoanAdmin(admin.ModelAdmin):
     list_display = ['loan_id', 'customer', 'loan_amount', 'interest_rate',
                     'tenure', 'monthly_repayment', 'is_active', 'start_date', 'end_date']
-    search_fields = ['loan_id', 'customer__first_name', 'customer__last_name']
+    list_select_related = ['customer']
+    search_fields = ['customer__first_name', 'customer__last_name']
+    search_help_text = 'Loan ID or customer ID (exact), or part of the customer name'
     list_filter = ['is_active', 'start_date', 'created_at']
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['customer']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Numeric terms match the loan_id and customer_id indexes exactly;
+        name searches use the trigram indexes on the customers table
+        """
+        search_term = search_term.strip()
+        if search_term.isdigit():
+            value = int(search_term)
+            return queryset.filter(Q(loan_id=value) | Q(customer_id=value)), False
+        return super().get_search_results(request, queryset, search_term)
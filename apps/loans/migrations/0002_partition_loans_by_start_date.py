@@ -0,0 +1,121 @@
+"""
+Convert the loans table to a PostgreSQL table range-partitioned by
+start_date with one partition per year plus a default partition.
+
+The rows are copied into the new table inside the migration transaction,
+so on a large table run it during a maintenance window. PostgreSQL requires
+the partition key in the primary key, which becomes (loan_id, start_date);
+uniqueness of loan_id alone is enforced by 0004_loan_id_registry. Other
+databases are left as is.
+"""
+import re
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+from apps.loans.partitions import (
+    LOANS_TABLE,
+    create_default_partition,
+    create_year_partition,
+)
+
+OLD_TABLE = 'loans_old'
+SEQUENCE = 'loans_loan_id_part_seq'
+PARTITION_YEARS_AHEAD = 2
+
+
+def _copy_definitions(cursor):
+    """Index and constraint definitions of the old table, to recreate on the new one"""
+    cursor.execute(
+        """
+        SELECT indexdef FROM pg_indexes
+        WHERE tablename = %s AND indexname NOT IN (
+            SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass
+        )
+        """,
+        [OLD_TABLE, OLD_TABLE]
+    )
+    indexes = [
+        re.sub(rf' ON (ONLY )?(\S+\.)?{OLD_TABLE} ', f' ON {LOANS_TABLE} ', indexdef)
+        for (indexdef,) in cursor.fetchall()
+    ]
+
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype IN ('f', 'c')
+        """,
+        [OLD_TABLE]
+    )
+    constraints = cursor.fetchall()
+
+    return indexes, constraints
+
+
+def _rebuild_loans_table(cursor, partitioned):
+    cursor.execute(f'ALTER TABLE {LOANS_TABLE} RENAME TO {OLD_TABLE}')
+    cursor.execute(f'ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT {LOANS_TABLE}_pkey TO {OLD_TABLE}_pkey')
+    indexes, constraints = _copy_definitions(cursor)
+
+    partition_clause = ' PARTITION BY RANGE (start_date)' if partitioned else ''
+    cursor.execute(
+        f'CREATE TABLE {LOANS_TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS){partition_clause}'
+    )
+    primary_key = 'loan_id, start_date' if partitioned else 'loan_id'
+    cursor.execute(f'ALTER TABLE {LOANS_TABLE} ADD CONSTRAINT {LOANS_TABLE}_pkey PRIMARY KEY ({primary_key})')
+
+    # Identity columns are not supported on partitioned tables before
+    # PostgreSQL 17, so loan_id is backed by a plain sequence
+    cursor.execute(f'CREATE SEQUENCE IF NOT EXISTS {SEQUENCE}')
+    cursor.execute(f"ALTER TABLE {LOANS_TABLE} ALTER COLUMN loan_id SET DEFAULT nextval('{SEQUENCE}')")
+
+    if partitioned:
+        cursor.execute(
+            f'SELECT EXTRACT(YEAR FROM MIN(start_date))::int FROM {OLD_TABLE}'
+        )
+        # Cover LOAN_PARTITION_FIRST_YEAR even on an empty table, so loans
+        # ingested after migrating do not all land in the default partition
+        first_year = min(cursor.fetchone()[0] or timezone.now().year, settings.LOAN_PARTITION_FIRST_YEAR)
+        for year in range(first_year, timezone.now().year + PARTITION_YEARS_AHEAD + 1):
+            create_year_partition(cursor, year)
+        create_default_partition(cursor)
+
+    cursor.execute(f'INSERT INTO {LOANS_TABLE} SELECT * FROM {OLD_TABLE}')
+    cursor.execute(
+        f"SELECT setval('{SEQUENCE}', COALESCE((SELECT MAX(loan_id) FROM {LOANS_TABLE}), 0) + 1, false)"
+    )
+    cursor.execute(f'ALTER SEQUENCE {SEQUENCE} OWNED BY {LOANS_TABLE}.loan_id')
+    cursor.execute(f'DROP TABLE {OLD_TABLE}')
+
+    for indexdef in indexes:
+        cursor.execute(indexdef)
+    for name, definition in constraints:
+        cursor.execute(f'ALTER TABLE {LOANS_TABLE} ADD CONSTRAINT {name} {definition}')
+
+    cursor.execute(f'ANALYZE {LOANS_TABLE}')
+
+
+def partition_loans(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        _rebuild_loans_table(cursor, partitioned=True)
+
+
+def unpartition_loans(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        _rebuild_loans_table(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_loans, unpartition_loans),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0002_partition_loans_by_start_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['end_date'], name='loans_end_dat_46d6ac_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+"""
+Enforce that loan_id is unique on the partitioned loans table.
+
+PostgreSQL only allows unique indexes on a partitioned table when they
+include the partition key, so the primary key (loan_id, start_date) still
+allows two loans with the same loan_id in different years. A trigger keeps
+every loan_id in the loan_ids table, whose primary key rejects a duplicate
+with an IntegrityError. Other databases keep the plain loan_id primary key.
+"""
+from django.db import migrations
+
+from apps.loans.partitions import LOANS_TABLE, sync_loan_id_sequence
+
+REGISTRY_TABLE = 'loan_ids'
+FUNCTION = 'loans_register_loan_id'
+TRIGGER = 'loans_loan_id_unique'
+
+
+def add_loan_id_registry(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE {REGISTRY_TABLE} (loan_id integer PRIMARY KEY)')
+        # Fails if duplicates were already stored; they must be resolved first
+        cursor.execute(f'INSERT INTO {REGISTRY_TABLE} (loan_id) SELECT loan_id FROM {LOANS_TABLE}')
+        cursor.execute(
+            f"""
+            CREATE FUNCTION {FUNCTION}() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'UPDATE' AND OLD.loan_id = NEW.loan_id THEN
+                    RETURN NULL;
+                END IF;
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    DELETE FROM {REGISTRY_TABLE} WHERE loan_id = OLD.loan_id;
+                END IF;
+                IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                    INSERT INTO {REGISTRY_TABLE} (loan_id) VALUES (NEW.loan_id);
+                END IF;
+                RETURN NULL;
+            END
+            $$
+            """
+        )
+        cursor.execute(
+            f'CREATE TRIGGER {TRIGGER} AFTER INSERT OR DELETE OR UPDATE OF loan_id '
+            f'ON {LOANS_TABLE} FOR EACH ROW EXECUTE FUNCTION {FUNCTION}()'
+        )
+
+    # Loans ingested before this migration may be ahead of the sequence
+    sync_loan_id_sequence(using=connection.alias)
+
+
+def remove_loan_id_registry(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'DROP TRIGGER {TRIGGER} ON {LOANS_TABLE}')
+        cursor.execute(f'DROP FUNCTION {FUNCTION}()')
+        cursor.execute(f'DROP TABLE {REGISTRY_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0003_loan_end_date_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_loan_id_registry, remove_loan_id_registry),
+    ]
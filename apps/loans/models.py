@@ -42,10 +42,12 @@ class Loan(models.Model):
             models.Index(fields=['customer', 'is_active']),
             models.Index(fields=['loan_id']),
             models.Index(fields=['start_date', 'end_date']),
+            models.Index(fields=['end_date']),
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
-        return f"Loan {self.loan_id} - Customer {self.customer.customer_id}"
+        return f"Loan {self.loan_id} - Customer {self.customer_id}"
 
     @property
     def repayments_left(self):
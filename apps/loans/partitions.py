@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from apps.core.utils import sync_id_sequence
+
+LOANS_TABLE = 'loans'
+DEFAULT_PARTITION = 'loans_default'
+
+
+def partition_name(year):
+    return f'{LOANS_TABLE}_y{year}'
+
+
+def is_partitioned(connection):
+    if connection.vendor != 'postgresql':
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)',
+            [LOANS_TABLE]
+        )
+        return cursor.fetchone()[0]
+
+
+def create_year_partition(cursor, year):
+    """Create the partition holding loans that start in the given year"""
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS {partition_name(year)} PARTITION OF {LOANS_TABLE} '
+        f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+    )
+
+
+def create_default_partition(cursor):
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {LOANS_TABLE} DEFAULT')
+
+
+def existing_partition_years(cursor):
+    cursor.execute(
+        """
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = %s::regclass
+        """,
+        [LOANS_TABLE]
+    )
+    prefix = partition_name('')
+    return {
+        int(name[len(prefix):]) for (name,) in cursor.fetchall()
+        if name.startswith(prefix) and name[len(prefix):].isdigit()
+    }
+
+
+def split_year_partition(cursor, year):
+    """
+    Create the partition for year when the default partition may already
+    hold loans starting in that year. PostgreSQL refuses to create it while
+    it does, so those rows are taken out of the default partition first and
+    inserted again through the parent, which routes them to the new
+    partition. Run inside a transaction.
+    """
+    moved = f'{LOANS_TABLE}_moved_y{year}'
+    bounds = [f'{year}-01-01', f'{year + 1}-01-01']
+    cursor.execute(f'CREATE TEMPORARY TABLE {moved} (LIKE {LOANS_TABLE})')
+    cursor.execute(
+        f'WITH taken AS ('
+        f'DELETE FROM {DEFAULT_PARTITION} WHERE start_date >= %s AND start_date < %s RETURNING *'
+        f') INSERT INTO {moved} SELECT * FROM taken',
+        bounds
+    )
+    create_year_partition(cursor, year)
+    cursor.execute(f'INSERT INTO {LOANS_TABLE} SELECT * FROM {moved}')
+    cursor.execute(f'DROP TABLE {moved}')
+
+
+def ensure_year_partitions(years, using='default'):
+    """
+    Make sure a yearly partition exists for each of the given start_date
+    years, moving matching loans out of the default partition.
+    Returns: list of partition names that were created
+    """
+    connection = connections[using]
+    if not is_partitioned(connection):
+        return []
+
+    created = []
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        missing = sorted(set(years) - existing_partition_years(cursor))
+        for year in missing:
+            split_year_partition(cursor, year)
+            created.append(partition_name(year))
+    return created
+
+
+def ensure_loan_partitions(years_ahead=None, using='default'):
+    """
+    Create yearly partitions from LOAN_PARTITION_FIRST_YEAR up to years_ahead
+    years in the future, plus one for every year found in the default
+    partition. Partitions must exist before loans for that year arrive,
+    otherwise the rows land in the default partition.
+    Returns: list of partition names that were checked or created
+    """
+    connection = connections[using]
+    if not is_partitioned(connection):
+        return []
+
+    if years_ahead is None:
+        years_ahead = settings.LOAN_PARTITION_YEARS_AHEAD
+
+    current_year = timezone.now().year
+    years = set(range(settings.LOAN_PARTITION_FIRST_YEAR, current_year + years_ahead + 1))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT DISTINCT EXTRACT(YEAR FROM start_date)::int FROM {DEFAULT_PARTITION}'
+        )
+        years.update(year for (year,) in cursor.fetchall())
+
+    ensure_year_partitions(years, using=using)
+    return [partition_name(year) for year in sorted(years)]
+
+
+def sync_loan_id_sequence(using='default'):
+    """Move the loan_id sequence past the highest stored loan_id"""
+    sync_id_sequence(LOANS_TABLE, 'loan_id', using=using)
@@ -0,0 +1,50 @@
+import unittest
+from datetime import date
+from django.db import connection
+from django.test import TestCase
+from apps.core.tasks import _ingest_loan_rows
+from apps.customers.models import Customer
+from apps.loans.models import Loan
+from apps.loans.partitions import DEFAULT_PARTITION, ensure_loan_partitions, partition_name
+
+
+def loans_by_partition():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT tableoid::regclass::text, COUNT(*) FROM loans GROUP BY 1')
+        return dict(cursor.fetchall())
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'loans is only partitioned on PostgreSQL')
+class LoanPartitionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(
+            first_name='John', last_name='Doe', phone_number=9876543210, monthly_salary=50000
+        )
+
+    def test_ingested_historical_loans_land_in_year_partitions(self):
+        # Years before LOAN_PARTITION_FIRST_YEAR have no partition up front
+        rows = [
+            (self.customer.customer_id, 1000 + index, 100000, 12, 10, 8792, 12,
+             date(year, 6, 1), date(year + 1, 6, 1))
+            for index, year in enumerate([1995, 1995, 1996, 2012])
+        ]
+        self.assertEqual(_ingest_loan_rows(rows), (4, 0))
+
+        self.assertEqual(loans_by_partition(), {
+            partition_name(1995): 2,
+            partition_name(1996): 1,
+            partition_name(2012): 1,
+        })
+
+    def test_moves_loans_out_of_the_default_partition(self):
+        loan = Loan.objects.create(
+            customer=self.customer, loan_amount=1000, tenure=12, interest_rate=10,
+            monthly_repayment=88, start_date=date(1990, 1, 1), end_date=date(1991, 1, 1)
+        )
+        self.assertEqual(loans_by_partition(), {DEFAULT_PARTITION: 1})
+
+        self.assertIn(partition_name(1990), ensure_loan_partitions())
+
+        self.assertEqual(loans_by_partition(), {partition_name(1990): 1})
+        self.assertEqual(Loan.objects.get(loan_id=loan.loan_id).start_date, date(1990, 1, 1))
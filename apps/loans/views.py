@@ -18,6 +18,9 @@ from .serializers import (
 )
 from apps.core.services.eligibility import EligibilityService
 from apps.core.services.emi_calculator import EMICalculator
+from apps.core.idempotency import idempotent
+from apps.core.decision_log import decision_log
+from apps.core.metrics import record_eligibility_decision
 
 
 class CheckEligibilityView(APIView):
@@ -38,11 +41,13 @@ class CheckEligibilityView(APIView):
             )
 
         eligibility_service = EligibilityService(customer)
-        eligibility_result = eligibility_service.check_eligibility(
+        eligibility_result = eligibility_service.check_eligibility_coalesced(
             loan_amount=data['loan_amount'],
             interest_rate=data['interest_rate'],
             tenure=data['tenure']
         )
+        decision_log.record('check-eligibility', customer_id, data, eligibility_result)
+        record_eligibility_decision(eligibility_result)
 
         response_data = {
             'customer_id': customer_id,
@@ -58,6 +63,7 @@ class CheckEligibilityView(APIView):
 
 
 class CreateLoanView(APIView):
+    @idempotent
     def post(self, request):
         serializer = LoanCreationRequestSerializer(data=request.data)
         if not serializer.is_valid():
@@ -82,6 +88,8 @@ class CreateLoanView(APIView):
         )
 
         if not eligibility_result['approval']:
+            decision_log.record('create-loan', customer_id, data, eligibility_result)
+            record_eligibility_decision(eligibility_result)
             response_data = {
                 'loan_id': None,
                 'customer_id': customer_id,
@@ -116,6 +124,9 @@ class CreateLoanView(APIView):
         customer.current_debt += Decimal(str(monthly_installment)) * data['tenure']
         customer.save()
 
+        decision_log.record('create-loan', customer_id, data, eligibility_result, loan_id=loan.loan_id)
+        record_eligibility_decision(eligibility_result)
+
         response_data = {
             'loan_id': loan.loan_id,
             'customer_id': customer_id,
@@ -1,5 +1,5 @@
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,9 +23,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.metrics.MetricsMiddleware',
+    'apps.core.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'apps.core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -54,7 +57,7 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': config('DB_ENGINE', default='django.db.backends.postgresql'),
         'NAME': config('DB_NAME', default='credit_approval_db'),
         'USER': config('DB_USER', default='postgres'),
         'PASSWORD': config('DB_PASSWORD', default='postgres'),
@@ -63,6 +66,24 @@ DATABASES = {
     }
 }
 
+# Read replicas: a host per replica, or a database file per replica when
+# DB_ENGINE is sqlite3 (useful to exercise routing locally)
+for index, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    replica_key = 'NAME' if DATABASES['default']['ENGINE'].endswith('sqlite3') else 'HOST'
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        replica_key: replica,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['apps.core.db_router.PrimaryReplicaRouter']
+DATABASE_REPLICA_URL_NAMES = config(
+    'DATABASE_REPLICA_URL_NAMES',
+    default='check-eligibility,view-loan,view-customer-loans',
+    cast=Csv()
+)
+DATABASE_REPLICA_LAG_TOLERANCE = config('DATABASE_REPLICA_LAG_TOLERANCE', default=5, cast=int)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -99,14 +120,81 @@ REST_FRAMEWORK = {
 }
 
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
-CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
-CELERY_RESULT_BACKEND = 'django-db'
 CELERY_CACHE_BACKEND = 'django-cache'
 
+# Results: tasks are fire-and-forget unless they opt in with
+# ignore_result=False. Stored results go to Redis by default (set
+# CELERY_RESULT_BACKEND=django-db to keep them in PostgreSQL) and expire
+# after CELERY_RESULT_EXPIRES seconds; beat runs the backend cleanup daily.
+CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_RESULT_EXPIRES = config('CELERY_RESULT_EXPIRES', default=24 * 60 * 60, cast=int)
+CELERY_TASK_TRACK_STARTED = config('CELERY_TASK_TRACK_STARTED', default=False, cast=bool)
+
+# Queues: short tasks stay on the default queue; long-running ingestion and
+# report shards get their own queue so a worker with prefetch 1 and late
+# acks can consume them (see docker-compose.yml)
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'apps.core.tasks.ingest_customer_data': {'queue': 'batch'},
+    'apps.core.tasks.ingest_loan_data': {'queue': 'batch'},
+    'apps.core.tasks.generate_statement_shard': {'queue': 'batch'},
+}
+CELERY_WORKER_PREFETCH_MULTIPLIER = config('CELERY_WORKER_PREFETCH_MULTIPLIER', default=4, cast=int)
+CELERY_BEAT_SCHEDULE = {
+    'create-loan-partitions': {
+        'task': 'apps.core.tasks.create_loan_partitions',
+        'schedule': 7 * 24 * 60 * 60,
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_URL', default='redis://localhost:6379/1'),
+    }
+}
+
+CUSTOMER_BULK_REGISTER_MAX_ROWS = config('CUSTOMER_BULK_REGISTER_MAX_ROWS', default=10000, cast=int)
+CUSTOMER_BULK_REGISTER_BATCH_SIZE = config('CUSTOMER_BULK_REGISTER_BATCH_SIZE', default=1000, cast=int)
+
+ELIGIBILITY_COALESCE_ACROSS_WORKERS = config('ELIGIBILITY_COALESCE_ACROSS_WORKERS', default=False, cast=bool)
+ELIGIBILITY_COALESCE_TIMEOUT = config('ELIGIBILITY_COALESCE_TIMEOUT', default=5, cast=int)
+ELIGIBILITY_COALESCE_RESULT_TTL = config('ELIGIBILITY_COALESCE_RESULT_TTL', default=2, cast=int)
+
+IDEMPOTENCY_KEY_TTL = config('IDEMPOTENCY_KEY_TTL', default=24 * 60 * 60, cast=int)
+IDEMPOTENCY_LOCK_TIMEOUT = config('IDEMPOTENCY_LOCK_TIMEOUT', default=30, cast=int)
+IDEMPOTENCY_POLL_INTERVAL = 0.05
+
+# Earliest loan start_date year that gets its own partition up front
+LOAN_PARTITION_FIRST_YEAR = config('LOAN_PARTITION_FIRST_YEAR', default=2010, cast=int)
+LOAN_PARTITION_YEARS_AHEAD = config('LOAN_PARTITION_YEARS_AHEAD', default=2, cast=int)
+
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int)
+
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_TOKEN_MAX_AGE = config('PROFILING_TOKEN_MAX_AGE', default=24 * 60 * 60, cast=int)
+PROFILING_DIR = Path(config('PROFILING_DIR', default=str(BASE_DIR / 'profiles')))
+
+# Cold-start import time budget of the API profile, enforced by the test suite
+STARTUP_IMPORT_BUDGET_MS = config('STARTUP_IMPORT_BUDGET_MS', default=800, cast=float)
+
+DECISION_LOG_ENABLED = config('DECISION_LOG_ENABLED', default=True, cast=bool)
+DECISION_LOG_MAX_BUFFER = config('DECISION_LOG_MAX_BUFFER', default=10000, cast=int)
+DECISION_LOG_BATCH_SIZE = config('DECISION_LOG_BATCH_SIZE', default=500, cast=int)
+DECISION_LOG_FLUSH_INTERVAL = config('DECISION_LOG_FLUSH_INTERVAL', default=1.0, cast=float)
+DECISION_LOG_MAX_RETRIES = config('DECISION_LOG_MAX_RETRIES', default=5, cast=int)
+
+INGESTION_BATCH_SIZE = config('INGESTION_BATCH_SIZE', default=1000, cast=int)
+
+STATEMENTS_DIR = Path(config('STATEMENTS_DIR', default=str(BASE_DIR / 'statements')))
+STATEMENT_SHARDS = config('STATEMENT_SHARDS', default=4, cast=int)
+STATEMENT_PROGRESS_INTERVAL = 100
+
 DATA_DIR = Path(config('DATA_DIR', default=str(BASE_DIR / 'data')))
@@ -1,14 +1,20 @@
-from django.contrib import admin
+from django.apps import apps
 from django.http import JsonResponse
 from django.urls import path, include
+from apps.core.metrics import metrics_view
 
 
 def health_view(request):
     return JsonResponse({'status': 'ok'})
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('health', health_view, name='health'),
+    path('metrics', metrics_view, name='metrics'),
     path('', include('apps.customers.urls')),
     path('', include('apps.loans.urls')),
 ]
+
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.append(path('admin/', admin.site.urls))
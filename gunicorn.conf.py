@@ -0,0 +1,3 @@
+def child_exit(server, worker):
+    from apps.core.metrics import mark_process_dead
+    mark_process_dead(worker.pid)